@@ -1,6 +1,6 @@
 """API endpoint for DNSBL checks."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
@@ -13,12 +13,21 @@ from app.services.dnsbl_checker import get_checker
 from app.core.config import settings
 
 router = APIRouter(prefix="/check", tags=["check"])
-limiter = Limiter(key_func=get_remote_address)
+
+# Moving-window limiting avoids the 2x burst a fixed window allows at the
+# window boundary; point RATE_LIMIT_STORAGE_URI at Redis to share limits
+# between workers.
+limiter = Limiter(
+    key_func=get_remote_address,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+)
+CHECK_RATE_LIMIT = f"{settings.RATE_LIMIT_PER_MINUTE}/minute"
 
 
 @router.post("", response_model=CheckResponse, status_code=status.HTTP_200_OK)
-@limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
-async def check_ips(request: CheckRequest):
+@limiter.limit(CHECK_RATE_LIMIT)
+async def check_ips(request: Request, check_request: CheckRequest):
     """
     Check IPs/Domains against DNSBL blacklists.
 
@@ -42,17 +51,18 @@ async def check_ips(request: CheckRequest):
         checker = get_checker()
 
         # Get zones to check
-        zones = request.zones
+        zones = check_request.zones
         if not zones:
             # Get default zones from settings
             zones = settings.DEFAULT_ZONES
 
         # Perform checks
         summary_data, results_data = await checker.check_multiple(
-            targets=request.ips,
+            targets=check_request.ips,
             zones=zones,
-            include_txt=request.include_txt,
-            concurrency=request.concurrency,
+            include_txt=check_request.include_txt,
+            concurrency=check_request.concurrency,
+            timeout_ms=check_request.timeout_ms,
         )
 
         return CheckResponse(
@@ -1,19 +1,28 @@
 """API endpoints for Prometheus metrics."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from prometheus_client import (
+    REGISTRY,
     Counter,
     Gauge,
     Histogram,
     generate_latest,
     CONTENT_TYPE_LATEST,
 )
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.models.database import CheckResult, MonitorRun, Target, Zone, Alert
+from app.services.dnsbl_checker import get_checker
 
-router = APIRouter(tags=["metrics"])
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+# Scrapes are served uncompressed and must never be cached by proxies
+METRICS_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Content-Encoding": "identity",
+}
 
 # Define Prometheus metrics
 check_requests_total = Counter(
@@ -74,12 +83,34 @@ cache_max_size_gauge = Gauge(
     'Maximum DNS cache size',
 )
 
+reports_cleaned_total = Counter(
+    'dnsbl_reports_cleaned_total',
+    'Total number of report files removed by cleanup',
+)
+
 alerts_total = Gauge(
     'dnsbl_alerts_total',
     'Total number of alerts',
     ['alert_type']
 )
 
+# Label children for the fixed label sets, bound once instead of per update
+TARGET_GAUGES = {
+    (target_type, enabled): current_targets_gauge.labels(
+        type=target_type, enabled=str(enabled).lower()
+    )
+    for target_type in ("ip", "domain")
+    for enabled in (True, False)
+}
+ZONE_GAUGES = {
+    enabled: current_zones_gauge.labels(enabled=str(enabled).lower())
+    for enabled in (True, False)
+}
+ALERT_GAUGES = {
+    alert_type: alerts_total.labels(alert_type=alert_type)
+    for alert_type in ('newly_listed', 'delisted', 'blocked', 'error', 'persistent')
+}
+
 
 @router.get("", include_in_schema=False)
 async def metrics():
@@ -88,41 +119,37 @@ async def metrics():
 
     This endpoint returns metrics in Prometheus format for monitoring and alerting.
     """
-    metrics_data = generate_latest()
-    from fastapi import Response
-    return Response(content=metrics_data, media_type=CONTENT_TYPE_LATEST)
+    return Response(
+        content=generate_latest(REGISTRY),
+        media_type=CONTENT_TYPE_LATEST,
+        headers=METRICS_HEADERS,
+    )
 
 
 @router.get("/update", dependencies=[Depends(get_db)])
-async def update_metrics(db: Session = Depends(get_db)):
+def update_metrics(db: Session = Depends(get_db)):
     """
     Update Prometheus metrics from database.
 
     This endpoint updates all gauge metrics with current values from the database.
     This is typically called by a background task or scheduler.
     """
-    from app.services.dnsbl_checker import get_checker
-
-    # Update target gauges
-    total_targets = db.query(Target).count()
-    enabled_targets = db.query(Target).filter(Target.enabled == True).count()
-    disabled_targets = total_targets - enabled_targets
-
-    ip_targets = db.query(Target).filter(Target.type == 'ip').count()
-    domain_targets = db.query(Target).filter(Target.type == 'domain').count()
-
-    current_targets_gauge.labels(type='ip', enabled='true').set(ip_targets)
-    current_targets_gauge.labels(type='ip', enabled='false').set(total_targets - enabled_targets)
-    current_targets_gauge.labels(type='domain', enabled='true').set(domain_targets)
-    current_targets_gauge.labels(type='domain', enabled='false').set(total_targets - enabled_targets)
+    # Update target gauges (one grouped count instead of a query per label set)
+    target_counts = {
+        (target_type, enabled): count
+        for target_type, enabled, count in db.execute(
+            select(Target.type, Target.enabled, func.count()).group_by(Target.type, Target.enabled)
+        )
+    }
+    for key, gauge in TARGET_GAUGES.items():
+        gauge.set(target_counts.get(key, 0))
 
     # Update zone gauges
-    total_zones = db.query(Zone).count()
-    enabled_zones = db.query(Zone).filter(Zone.enabled == True).count()
-    disabled_zones = total_zones - enabled_zones
-
-    current_zones_gauge.labels(enabled='true').set(enabled_zones)
-    current_zones_gauge.labels(enabled='false').set(disabled_zones)
+    zone_counts = dict(
+        db.execute(select(Zone.enabled, func.count()).group_by(Zone.enabled)).all()
+    )
+    for enabled, gauge in ZONE_GAUGES.items():
+        gauge.set(zone_counts.get(enabled, 0))
 
     # Update cache gauges
     checker = get_checker()
@@ -131,18 +158,10 @@ async def update_metrics(db: Session = Depends(get_db)):
     cache_max_size_gauge.set(cache_stats['max_size'])
 
     # Update alert gauges
-    from app.models.database import Alert
-
-    newly_listed_alerts = db.query(Alert).filter(Alert.alert_type == 'newly_listed').count()
-    delisted_alerts = db.query(Alert).filter(Alert.alert_type == 'delisted').count()
-    blocked_alerts = db.query(Alert).filter(Alert.alert_type == 'blocked').count()
-    error_alerts = db.query(Alert).filter(Alert.alert_type == 'error').count()
-    persistent_alerts = db.query(Alert).filter(Alert.alert_type == 'persistent').count()
-
-    alerts_total.labels(alert_type='newly_listed').set(newly_listed_alerts)
-    alerts_total.labels(alert_type='delisted').set(delisted_alerts)
-    alerts_total.labels(alert_type='blocked').set(blocked_alerts)
-    alerts_total.labels(alert_type='error').set(error_alerts)
-    alerts_total.labels(alert_type='persistent').set(persistent_alerts)
+    alert_counts = dict(
+        db.execute(select(Alert.alert_type, func.count()).group_by(Alert.alert_type)).all()
+    )
+    for alert_type, gauge in ALERT_GAUGES.items():
+        gauge.set(alert_counts.get(alert_type, 0))
 
     return {"status": "metrics updated"}
@@ -1,8 +1,8 @@
 """API endpoints for monitoring runs."""
 
-from datetime import datetime
-
 from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -17,9 +17,26 @@ from app.services.monitoring import get_monitoring_service
 
 router = APIRouter(prefix="/monitor", tags=["monitor"])
 
+# Columns serialized for MonitorRunResponse
+MONITOR_RUN_COLUMNS = (
+    MonitorRun.id,
+    MonitorRun.triggered_by,
+    MonitorRun.status,
+    MonitorRun.error_message,
+    MonitorRun.total_targets,
+    MonitorRun.total_zones,
+    MonitorRun.total_checks,
+    MonitorRun.listed_count,
+    MonitorRun.blocked_count,
+    MonitorRun.error_count,
+    MonitorRun.started_at,
+    MonitorRun.finished_at,
+    MonitorRun.duration_seconds,
+)
+
 
 @router.post("/run", response_model=MonitorRunResponse, status_code=status.HTTP_202_ACCEPTED)
-async def trigger_monitor_run(
+def trigger_monitor_run(
     background_tasks: BackgroundTasks,
     request: MonitorRunRequest = Body(default_factory=MonitorRunRequest),
     triggered_by: str = Query("api", description="Who triggered the run (api/manual/scheduler)"),
@@ -37,15 +54,14 @@ async def trigger_monitor_run(
     # Create a monitor run record
     monitoring_service = get_monitoring_service()
 
-    # Create initial run record
-    run = MonitorRun(
-        triggered_by=triggered_by,
-        status="running",
-        started_at=datetime.utcnow(),
-    )
-    db.add(run)
+    # Create initial run record; RETURNING hands back the generated id and
+    # defaults in the same round-trip as the INSERT
+    run = db.execute(
+        insert(MonitorRun)
+        .values(triggered_by=triggered_by, status="running")
+        .returning(*MONITOR_RUN_COLUMNS)
+    ).one()
     db.commit()
-    db.refresh(run)
 
     # Run in background
     async def run_monitoring():
@@ -54,6 +70,7 @@ async def trigger_monitor_run(
                 triggered_by=triggered_by,
                 target_ids=request.target_ids,
                 zone_ids=request.zone_ids,
+                run_id=run.id,
             )
         except Exception as e:
             # Error is already handled in run_monitoring
@@ -61,25 +78,11 @@ async def trigger_monitor_run(
 
     background_tasks.add_task(run_monitoring)
 
-    return MonitorRunResponse(
-        id=run.id,
-        triggered_by=run.triggered_by,
-        status=run.status,
-        error_message=run.error_message,
-        total_targets=run.total_targets,
-        total_zones=run.total_zones,
-        total_checks=run.total_checks,
-        listed_count=run.listed_count,
-        blocked_count=run.blocked_count,
-        error_count=run.error_count,
-        started_at=run.started_at,
-        finished_at=run.finished_at,
-        duration_seconds=run.duration_seconds,
-    )
+    return MonitorRunResponse.model_construct(**run._asdict())
 
 
-@router.get("/runs", response_model=MonitorRunListResponse)
-async def list_monitor_runs(
+@router.get("/runs", response_model=None, responses={200: {"model": MonitorRunListResponse}})
+def list_monitor_runs(
     triggered_by: str = Query(None, description="Filter by who triggered the run"),
     status_filter: str = Query(None, description="Filter by status (running/completed/failed)"),
     offset: int = Query(0, ge=0),
@@ -95,48 +98,32 @@ async def list_monitor_runs(
     - offset: Pagination offset (default: 0)
     - limit: Results per page (default: 100, max: 1000)
     """
-    from datetime import datetime
-
-    query = db.query(MonitorRun)
-
-    # Apply filters
+    # Build filters
+    filters = []
     if triggered_by:
-        query = query.filter(MonitorRun.triggered_by == triggered_by)
+        filters.append(MonitorRun.triggered_by == triggered_by)
 
     if status_filter:
-        query = query.filter(MonitorRun.status == status_filter)
-
-    # Get total count
-    total = query.count()
-
-    # Apply pagination
-    items = query.order_by(MonitorRun.started_at.desc()).offset(offset).limit(limit).all()
-
-    # Convert to response models
-    response_items = [
-        MonitorRunResponse(
-            id=item.id,
-            triggered_by=item.triggered_by,
-            status=item.status,
-            error_message=item.error_message,
-            total_targets=item.total_targets,
-            total_zones=item.total_zones,
-            total_checks=item.total_checks,
-            listed_count=item.listed_count,
-            blocked_count=item.blocked_count,
-            error_count=item.error_count,
-            started_at=item.started_at,
-            finished_at=item.finished_at,
-            duration_seconds=item.duration_seconds,
-        )
-        for item in items
-    ]
+        filters.append(MonitorRun.status == status_filter)
+
+    # Get total count (plain COUNT(*) rather than a counted subquery)
+    total = db.execute(select(func.count()).select_from(MonitorRun).where(*filters)).scalar()
+
+    # Apply pagination, selecting plain columns instead of hydrating ORM objects
+    rows = (
+        db.query(*MONITOR_RUN_COLUMNS)
+        .filter(*filters)
+        .order_by(MonitorRun.started_at.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
 
-    return MonitorRunListResponse(total=total, items=response_items)
+    return ORJSONResponse({"total": total, "items": [row._asdict() for row in rows]})
 
 
 @router.get("/runs/{run_id}", response_model=MonitorRunResponse)
-async def get_monitor_run(
+def get_monitor_run(
     run_id: int,
     db: Session = Depends(get_db),
 ):
@@ -148,7 +135,7 @@ async def get_monitor_run(
             detail=f"Monitor run {run_id} not found",
         )
 
-    return MonitorRunResponse(
+    return MonitorRunResponse.model_construct(
         id=run.id,
         triggered_by=run.triggered_by,
         status=run.status,
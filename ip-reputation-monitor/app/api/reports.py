@@ -6,11 +6,14 @@ import os
 from datetime import datetime
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.api.metrics import reports_cleaned_total
 from app.core.database import get_db, SessionLocal
 from app.models.database import Report
 from app.models.schemas import (
@@ -24,9 +27,39 @@ from app.services.reports import get_report_service
 router = APIRouter(prefix="/reports", tags=["reports"])
 logger = logging.getLogger(__name__)
 
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+}
+
+# Columns serialized for ReportResponse
+REPORT_COLUMNS = (
+    Report.id,
+    Report.report_type,
+    Report.status,
+    Report.error_message,
+    Report.date_from,
+    Report.date_to,
+    Report.file_path,
+    Report.file_size_bytes,
+    Report.created_at,
+    Report.completed_at,
+)
+
+
+def _load_filters(raw: Optional[str]) -> dict:
+    """Parse stored report filters (JSON, or the Python repr used by older rows)."""
+    if not raw:
+        return {}
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return ast.literal_eval(raw)
+
 
 @router.post("", response_model=ReportResponse, status_code=status.HTTP_202_ACCEPTED)
-async def create_report(
+def create_report(
     request: ReportCreate,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
@@ -40,27 +73,34 @@ async def create_report(
     - target_ids: Optional list of target IDs to include
     - zone_ids: Optional list of zone IDs to include
     - status_filter: Optional filter by status ('listed', 'blocked', 'error', or 'all')
+    - compress: Gzip CSV output (.csv.gz); ignored for xlsx and pdf
 
     The report is generated in the background. Use GET /reports/{id} to check status.
     """
-    # Create report record
-    report = Report(
-        report_type=request.report_type,
-        status="pending",
-        date_from=None,
-        date_to=None,
-        report_metadata="{}",
-    )
-    if request.target_ids or request.zone_ids or request.status_filter:
-        filters = {
+    filters = None
+    if request.target_ids or request.zone_ids or request.status_filter or request.compress:
+        filters = orjson.dumps({
             "target_ids": request.target_ids,
             "zone_ids": request.zone_ids,
             "status_filter": request.status_filter,
-        }
-        report.filters = str(filters)
-    db.add(report)
+            "compress": request.compress,
+        }).decode()
+
+    # Create report record; RETURNING hands back the generated id and
+    # defaults in the same round-trip as the INSERT
+    report = db.execute(
+        insert(Report)
+        .values(
+            report_type=request.report_type,
+            status="pending",
+            date_from=None,
+            date_to=None,
+            filters=filters,
+            report_metadata={},
+        )
+        .returning(*REPORT_COLUMNS)
+    ).one()
     db.commit()
-    db.refresh(report)
 
     # Generate report in background
     def generate_report(report_id: int):
@@ -78,12 +118,13 @@ async def create_report(
             background_db.commit()
 
             # Generate report
-            filters = ast.literal_eval(background_report.filters) if background_report.filters else {}
+            filters = _load_filters(background_report.filters)
             filepath, file_size = report_service.generate_report(
                 report_type=background_report.report_type,
                 target_ids=filters.get("target_ids"),
                 zone_ids=filters.get("zone_ids"),
                 status_filter=filters.get("status_filter"),
+                compress=filters.get("compress", False),
             )
 
             # Update report
@@ -111,22 +152,11 @@ async def create_report(
 
     background_tasks.add_task(generate_report, report.id)
 
-    return ReportResponse(
-        id=report.id,
-        report_type=report.report_type,
-        status=report.status,
-        error_message=report.error_message,
-        date_from=report.date_from,
-        date_to=report.date_to,
-        file_path=report.file_path,
-        file_size_bytes=report.file_size_bytes,
-        created_at=report.created_at,
-        completed_at=report.completed_at,
-    )
+    return ReportResponse.model_construct(**report._asdict())
 
 
 @router.get("", response_model=ReportListResponse)
-async def list_reports(
+def list_reports(
     status_filter: str = Query(None, description="Filter by status (pending/generating/completed/failed)"),
     report_type: str = Query(None, description="Filter by report type (csv/xlsx/pdf)"),
     offset: int = Query(0, ge=0),
@@ -142,24 +172,30 @@ async def list_reports(
     - offset: Pagination offset (default: 0)
     - limit: Results per page (default: 100, max: 1000)
     """
-    query = db.query(Report)
-
-    # Apply filters
+    # Build filters
+    filters = []
     if status_filter:
-        query = query.filter(Report.status == status_filter)
+        filters.append(Report.status == status_filter)
 
     if report_type:
-        query = query.filter(Report.report_type == report_type)
+        filters.append(Report.report_type == report_type)
 
-    # Get total count
-    total = query.count()
+    # Get total count (plain COUNT(*) rather than a counted subquery)
+    total = db.execute(select(func.count()).select_from(Report).where(*filters)).scalar()
 
     # Apply pagination
-    items = query.order_by(Report.created_at.desc()).offset(offset).limit(limit).all()
+    items = (
+        db.query(Report)
+        .filter(*filters)
+        .order_by(Report.created_at.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
 
-    # Convert to response models
+    # Rows come straight from the database, so skip per-field validation
     response_items = [
-        ReportResponse(
+        ReportResponse.model_construct(
             id=item.id,
             report_type=item.report_type,
             status=item.status,
@@ -174,11 +210,11 @@ async def list_reports(
         for item in items
     ]
 
-    return ReportListResponse(total=total, items=response_items)
+    return ReportListResponse.model_construct(total=total, items=response_items)
 
 
 @router.get("/{report_id}", response_model=ReportResponse)
-async def get_report(
+def get_report(
     report_id: int,
     db: Session = Depends(get_db),
 ):
@@ -190,7 +226,7 @@ async def get_report(
             detail=f"Report {report_id} not found",
         )
 
-    return ReportResponse(
+    return ReportResponse.model_construct(
         id=report.id,
         report_type=report.report_type,
         status=report.status,
@@ -205,7 +241,7 @@ async def get_report(
 
 
 @router.get("/{report_id}/download")
-async def download_report(
+def download_report(
     report_id: int,
     db: Session = Depends(get_db),
 ):
@@ -223,32 +259,43 @@ async def download_report(
             detail=f"Report {report_id} is not ready for download (status: {report.status})",
         )
 
-    if not report.file_path or not os.path.exists(report.file_path):
+    # Stat once; FileResponse reuses the result instead of stat-ing again
+    try:
+        stat_result = os.stat(report.file_path) if report.file_path else None
+    except OSError:
+        stat_result = None
+    if stat_result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Report file not found",
         )
 
-    # Determine media type
-    media_types = {
-        "csv": "text/csv",
-        "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        "pdf": "application/pdf",
-    }
-    media_type = media_types.get(report.report_type, "application/octet-stream")
-
-    # Get filename
     filename = os.path.basename(report.file_path)
+    if filename.endswith(".gz"):
+        media_type = "application/gzip"
+    else:
+        media_type = MEDIA_TYPES.get(report.report_type, "application/octet-stream")
+
+    # Behind nginx, hand the file transfer off to the proxy
+    if settings.USE_XACCEL:
+        return Response(
+            media_type=media_type,
+            headers={
+                "X-Accel-Redirect": settings.XACCEL_REPORTS_PREFIX.rstrip("/") + "/" + filename,
+                "Content-Disposition": f'attachment; filename="{filename}"',
+            },
+        )
 
     return FileResponse(
         report.file_path,
         media_type=media_type,
         filename=filename,
+        stat_result=stat_result,
     )
 
 
 @router.delete("/{report_id}", response_model=MessageResponse)
-async def delete_report(
+def delete_report(
     report_id: int,
     db: Session = Depends(get_db),
 ):
@@ -271,24 +318,25 @@ async def delete_report(
     return MessageResponse(message=f"Report {report_id} deleted successfully")
 
 
-@router.post("/cleanup", response_model=MessageResponse)
+@router.post("/cleanup", response_model=MessageResponse, status_code=status.HTTP_202_ACCEPTED)
 async def cleanup_reports(
     background_tasks: BackgroundTasks,
     retention_days: int = Query(None, ge=1),
-    db: Session = Depends(get_db),
 ):
     """
-    Clean up old reports.
+    Clean up old reports (runs in the background).
 
     **Query Parameters:**
     - retention_days: Number of days to retain (default: from config)
+
+    The number of removed files is exported as dnsbl_reports_cleaned_total.
     """
     def cleanup():
         report_service = get_report_service()
         removed = report_service.cleanup_old_reports(retention_days)
-        return removed
+        reports_cleaned_total.inc(removed)
+        logger.info("Cleaned up %s old reports", removed)
 
-    # Run in background
-    removed_count = await cleanup()
+    background_tasks.add_task(cleanup)
 
-    return MessageResponse(message=f"Cleaned up {removed_count} old reports")
+    return MessageResponse(message="Cleanup scheduled")
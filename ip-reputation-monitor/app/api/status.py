@@ -1,10 +1,11 @@
 """API endpoints for status and history."""
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.models.database import CheckResult, Zone
+from app.models.database import TargetLatestStatus, Zone
 from app.models.schemas import (
     TargetStatusResponse,
     TargetHistoryResponse,
@@ -15,7 +16,7 @@ router = APIRouter(prefix="/status", tags=["status"])
 
 
 @router.get("", response_model=list[TargetStatusResponse])
-async def get_status(
+def get_status(
     type_filter: str = Query(None, description="Filter by target type (ip/domain)"),
     has_issues_only: bool = Query(False, description="Only return targets with issues"),
     limit: int = Query(100, ge=1, le=1000),
@@ -35,18 +36,13 @@ async def get_status(
     """
     monitoring_service = get_monitoring_service()
 
-    # Get all status data
-    all_status = monitoring_service.get_latest_status(db, limit=None)
-
-    # Apply filters
-    if type_filter:
-        all_status = [s for s in all_status if s["type"] == type_filter]
-
-    if has_issues_only:
-        all_status = [s for s in all_status if s["listed_count"] > 0 or s["blocked_count"] > 0 or s["error_count"] > 0]
-
-    # Apply limit
-    all_status = all_status[:limit]
+    # Filters and limit are applied in the database query
+    all_status = monitoring_service.get_latest_status(
+        db,
+        limit=limit,
+        type_filter=type_filter,
+        has_issues_only=has_issues_only,
+    )
 
     # Convert to response models
     response_items = [
@@ -69,7 +65,7 @@ async def get_status(
 
 
 @router.get("/summary")
-async def get_status_summary(
+def get_status_summary(
     db: Session = Depends(get_db),
 ):
     """
@@ -88,45 +84,21 @@ async def get_status_summary(
     # Count targets
     total_targets = db.query(Target).filter(Target.enabled == True).count()
 
-    # Count targets with issues
-    # This is an approximation - checking targets with recent check results
-    listed_targets = 0
-    blocked_targets = 0
-    error_targets = 0
-
-    enabled_targets = db.query(Target).filter(Target.enabled == True).all()
-    for target in enabled_targets:
-        # Get latest results
-        latest = (
-            db.query(CheckResult)
-            .filter(CheckResult.target_id == target.id)
-            .order_by(CheckResult.last_checked.desc())
-            .first()
-        )
-        if not latest:
-            continue
-
-        # Check status
-        all_status = (
-            db.query(CheckResult)
-            .filter(CheckResult.target_id == target.id)
-            .all()
+    # Count targets with issues from the pre-aggregated status table; each
+    # target is counted once, by its most severe status.
+    listed = TargetLatestStatus.listed_count > 0
+    blocked = TargetLatestStatus.blocked_count > 0
+    errored = TargetLatestStatus.error_count > 0
+    listed_targets, blocked_targets, error_targets = db.execute(
+        select(
+            func.sum(case((listed, 1), else_=0)),
+            func.sum(case((listed, 0), (blocked, 1), else_=0)),
+            func.sum(case((listed, 0), (blocked, 0), (errored, 1), else_=0)),
         )
-
-        for r in all_status:
-            if r.status == "listed":
-                listed_targets += 1
-                break
-        else:
-            for r in all_status:
-                if r.status == "blocked":
-                    blocked_targets += 1
-                    break
-            else:
-                for r in all_status:
-                    if r.status == "error":
-                        error_targets += 1
-                        break
+        .select_from(TargetLatestStatus)
+        .join(Target, TargetLatestStatus.target_id == Target.id)
+        .where(Target.enabled == True)
+    ).one()
 
     # Get last run
     last_run = (
@@ -151,15 +123,15 @@ async def get_status_summary(
 
     return {
         "total_targets": total_targets,
-        "listed_targets": listed_targets,
-        "blocked_targets": blocked_targets,
-        "error_targets": error_targets,
+        "listed_targets": listed_targets or 0,
+        "blocked_targets": blocked_targets or 0,
+        "error_targets": error_targets or 0,
         "last_run": last_run_info,
     }
 
 
 @router.get("/history/{target_id}", response_model=list[TargetHistoryResponse])
-async def get_target_history(
+def get_target_history(
     target_id: int,
     limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db),
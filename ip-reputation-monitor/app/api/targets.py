@@ -1,13 +1,18 @@
-"""API endpoints for target management."""
+"""API endpoints for target management.
+
+Response models are built with model_construct: their fields come straight
+from database rows, so validation is only applied to request bodies.
+"""
 
-import json
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, delete, func, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.models.database import Target
+from app.models.database import CheckResult, Target, TargetLatestStatus, TargetTag
 from app.models.schemas import (
     TargetCreate,
     TargetUpdate,
@@ -15,12 +20,84 @@ from app.models.schemas import (
     TargetListResponse,
     MessageResponse,
 )
+from app.services.monitoring import get_monitoring_service
 
 router = APIRouter(prefix="/targets", tags=["targets"])
 
+# Columns serialized for TargetResponse
+TARGET_COLUMNS = (
+    Target.id,
+    Target.target,
+    Target.type,
+    Target.label,
+    Target.tags,
+    Target.enabled,
+    Target.created_at,
+    Target.updated_at,
+)
+
+# Bulk deletes are split so each IN list stays under the driver's parameter limit
+MAX_BULK_DELETE = 100_000
+DELETE_CHUNK_SIZE = {"sqlite": 900}
+DEFAULT_DELETE_CHUNK_SIZE = 10_000
+
+# Built once so the compiled SQL and its cache key are reused per request
+TARGET_BY_ID = select(*TARGET_COLUMNS).where(Target.id == bindparam("target_id"))
+
+
+def _tag_rows(target_ids: list[int], tags: Optional[list[str]]) -> list[dict]:
+    """Build TargetTag rows for the given targets, skipping duplicate tags."""
+    unique_tags = list(dict.fromkeys(tags or []))
+    return [
+        {"target_id": target_id, "tag": tag}
+        for target_id in target_ids
+        for tag in unique_tags
+    ]
+
+
+def _delete_targets(db: Session, target_ids: list[int]) -> list[int]:
+    """
+    Delete targets and their dependent rows with set-based DELETEs.
+
+    Core DELETEs bypass the ORM cascades, so child rows are removed explicitly.
+    Ids are processed in dialect-sized chunks within the caller's transaction.
+    Returns the ids of the targets that existed. The caller commits.
+    """
+    chunk_size = DELETE_CHUNK_SIZE.get(
+        db.get_bind().dialect.name, DEFAULT_DELETE_CHUNK_SIZE
+    )
+    deleted_ids = []
+    for start in range(0, len(target_ids), chunk_size):
+        chunk = target_ids[start:start + chunk_size]
+        for model in (TargetTag, TargetLatestStatus, CheckResult):
+            db.execute(delete(model).where(model.target_id.in_(chunk)))
+        deleted_ids.extend(
+            db.scalars(delete(Target).where(Target.id.in_(chunk)).returning(Target.id))
+        )
+    return deleted_ids
+
+
+def backfill_target_tags(db: Session) -> int:
+    """
+    Populate target_tags from Target.tags for databases created before it.
 
-@router.post("", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
-async def create_targets(
+    Returns the number of tag rows inserted. The caller commits.
+    """
+    rows = []
+    for target_id, tags in db.execute(select(Target.id, Target.tags).where(Target.tags.is_not(None))):
+        rows.extend(_tag_rows([target_id], tags))
+    if rows:
+        db.execute(insert(TargetTag), rows)
+    return len(rows)
+
+
+@router.post(
+    "",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": MessageResponse}},
+)
+def create_targets(
     request: TargetCreate,
     db: Session = Depends(get_db),
 ):
@@ -34,28 +111,35 @@ async def create_targets(
     - tags: Optional list of tags
     - enabled: Whether the targets are enabled (default: true)
     """
-    created_count = 0
-    errors = []
-
-    for target_str in request.targets:
-        # Check if target already exists
-        existing = db.query(Target).filter(Target.target == target_str).first()
-        if existing:
-            errors.append(f"{target_str}: Already exists")
-            continue
-
-        # Create new target
-        target = Target(
-            target=target_str,
-            type=request.type,
-            label=request.label,
-            tags=json.dumps(request.tags) if request.tags else None,
-            enabled=request.enabled,
-        )
-        db.add(target)
-        created_count += 1
+    # Drop duplicates within the request, keeping the submitted order
+    candidates = list(dict.fromkeys(request.targets))
 
-    db.commit()
+    # Look up all existing targets in one query
+    existing = set(
+        db.scalars(select(Target.target).where(Target.target.in_(candidates))).all()
+    )
+    errors = [f"{target_str}: Already exists" for target_str in candidates if target_str in existing]
+
+    # Insert all new targets in a single statement
+    rows = [
+        {
+            "target": target_str,
+            "type": request.type,
+            "label": request.label,
+            "tags": request.tags or None,
+            "enabled": request.enabled,
+        }
+        for target_str in candidates
+        if target_str not in existing
+    ]
+    created_count = len(rows)
+    if rows:
+        target_ids = db.scalars(insert(Target).returning(Target.id), rows).all()
+        tag_rows = _tag_rows(target_ids, request.tags)
+        if tag_rows:
+            db.execute(insert(TargetTag), tag_rows)
+        db.commit()
+        get_monitoring_service().clear_status_cache()
 
     if created_count == 0:
         raise HTTPException(
@@ -63,13 +147,14 @@ async def create_targets(
             detail=f"No targets created. Errors: {', '.join(errors)}",
         )
 
-    return MessageResponse(
-        message=f"Created {created_count} targets",
+    return ORJSONResponse(
+        {"message": f"Created {created_count} targets", "id": None},
+        status_code=status.HTTP_201_CREATED,
     )
 
 
-@router.get("", response_model=TargetListResponse)
-async def list_targets(
+@router.get("", response_model=None, responses={200: {"model": TargetListResponse}})
+def list_targets(
     type_filter: Optional[str] = Query(None, description="Filter by type (ip/domain)"),
     status_filter: Optional[str] = Query(None, description="Filter by status (enabled/disabled)"),
     search: Optional[str] = Query(None, description="Search by target or label"),
@@ -89,7 +174,8 @@ async def list_targets(
     - offset: Pagination offset (default: 0)
     - limit: Results per page (default: 100, max: 1000)
     """
-    query = db.query(Target)
+    # The window count returns the filtered total alongside each page row
+    query = db.query(*TARGET_COLUMNS, func.count().over().label("total"))
 
     # Apply filters
     if type_filter:
@@ -105,62 +191,78 @@ async def list_targets(
         )
 
     if tags:
-        tag_list = [t.strip() for t in tags.split(",")]
-        for tag in tag_list:
-            query = query.filter(Target.tags.like(f'%"{tag}"%'))
-
-    # Get total count
-    total = query.count()
+        # Targets must carry every requested tag
+        tag_set = {t.strip() for t in tags.split(",") if t.strip()}
+        if tag_set:
+            query = query.filter(
+                Target.id.in_(
+                    select(TargetTag.target_id)
+                    .where(TargetTag.tag.in_(tag_set))
+                    .group_by(TargetTag.target_id)
+                    .having(func.count() == len(tag_set))
+                )
+            )
 
     # Apply pagination
     items = query.order_by(Target.created_at.desc()).offset(offset).limit(limit).all()
 
+    # An empty page past the end carries no total, so count separately
+    if items:
+        total = items[0].total
+    elif offset:
+        total = query.with_entities(func.count(Target.id)).scalar()
+    else:
+        total = 0
+
     # Convert tags from JSON
     response_items = []
     for item in items:
         response_items.append(
-            TargetResponse(
+            TargetResponse.model_construct(
                 id=item.id,
                 target=item.target,
                 type=item.type,
                 label=item.label,
-                tags=json.loads(item.tags) if item.tags else [],
+                tags=item.tags or [],
                 enabled=item.enabled,
                 created_at=item.created_at,
                 updated_at=item.updated_at,
             )
         )
 
-    return TargetListResponse(total=total, items=response_items)
+    # Serialize directly instead of through response_model
+    payload = TargetListResponse.model_construct(total=total, items=response_items)
+    return ORJSONResponse(payload.model_dump(mode="json"))
 
 
-@router.get("/{target_id}", response_model=TargetResponse)
-async def get_target(
+@router.get("/{target_id}", response_model=None, responses={200: {"model": TargetResponse}})
+def get_target(
     target_id: int,
     db: Session = Depends(get_db),
 ):
     """Get a specific target by ID."""
-    target = db.query(Target).filter(Target.id == target_id).first()
+    target = db.execute(TARGET_BY_ID, {"target_id": target_id}).first()
     if not target:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Target {target_id} not found",
         )
 
-    return TargetResponse(
+    payload = TargetResponse.model_construct(
         id=target.id,
         target=target.target,
         type=target.type,
         label=target.label,
-        tags=json.loads(target.tags) if target.tags else [],
+        tags=target.tags or [],
         enabled=target.enabled,
         created_at=target.created_at,
         updated_at=target.updated_at,
     )
+    return ORJSONResponse(payload.model_dump(mode="json"))
 
 
 @router.patch("/{target_id}", response_model=TargetResponse)
-async def update_target(
+def update_target(
     target_id: int,
     request: TargetUpdate,
     db: Session = Depends(get_db),
@@ -173,59 +275,76 @@ async def update_target(
     - tags: Optional new list of tags
     - enabled: Optional enabled status
     """
-    target = db.query(Target).filter(Target.id == target_id).first()
+    # Update fields
+    changes = {}
+    if request.label is not None:
+        changes["label"] = request.label
+
+    if request.tags is not None:
+        changes["tags"] = request.tags
+
+    if request.enabled is not None:
+        changes["enabled"] = request.enabled
+
+    # UPDATE ... RETURNING fetches the updated row in the same statement
+    if changes:
+        target = db.execute(
+            update(Target)
+            .where(Target.id == target_id)
+            .values(**changes)
+            .returning(*TARGET_COLUMNS)
+        ).first()
+    else:
+        target = db.execute(TARGET_BY_ID, {"target_id": target_id}).first()
+
     if not target:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Target {target_id} not found",
         )
 
-    # Update fields
-    if request.label is not None:
-        target.label = request.label
-
     if request.tags is not None:
-        target.tags = json.dumps(request.tags)
-
-    if request.enabled is not None:
-        target.enabled = request.enabled
+        db.execute(delete(TargetTag).where(TargetTag.target_id == target_id))
+        tag_rows = _tag_rows([target_id], request.tags)
+        if tag_rows:
+            db.execute(insert(TargetTag), tag_rows)
 
     db.commit()
-    db.refresh(target)
+    get_monitoring_service().clear_status_cache()
 
-    return TargetResponse(
+    return TargetResponse.model_construct(
         id=target.id,
         target=target.target,
         type=target.type,
         label=target.label,
-        tags=json.loads(target.tags) if target.tags else [],
+        tags=target.tags or [],
         enabled=target.enabled,
         created_at=target.created_at,
         updated_at=target.updated_at,
     )
 
 
-@router.delete("/{target_id}", response_model=MessageResponse)
-async def delete_target(
+@router.delete("/{target_id}", response_model=None, responses={200: {"model": MessageResponse}})
+def delete_target(
     target_id: int,
     db: Session = Depends(get_db),
 ):
     """Delete a target."""
-    target = db.query(Target).filter(Target.id == target_id).first()
-    if not target:
+    if not _delete_targets(db, [target_id]):
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Target {target_id} not found",
         )
 
-    db.delete(target)
     db.commit()
+    get_monitoring_service().clear_status_cache()
 
-    return MessageResponse(message=f"Target {target_id} deleted successfully")
+    return ORJSONResponse({"message": f"Target {target_id} deleted successfully", "id": None})
 
 
-@router.post("/bulk/delete", response_model=MessageResponse)
-async def bulk_delete_targets(
+@router.post("/bulk/delete", response_model=None, responses={200: {"model": MessageResponse}})
+def bulk_delete_targets(
     target_ids: list[int],
     db: Session = Depends(get_db),
 ):
@@ -236,7 +355,14 @@ async def bulk_delete_targets(
             detail="No target IDs provided",
         )
 
-    deleted_count = db.query(Target).filter(Target.id.in_(target_ids)).delete(synchronize_session=False)
+    if len(target_ids) > MAX_BULK_DELETE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_DELETE} target IDs can be deleted per request",
+        )
+
+    deleted_count = len(_delete_targets(db, list(dict.fromkeys(target_ids))))
     db.commit()
+    get_monitoring_service().clear_status_cache()
 
-    return MessageResponse(message=f"Deleted {deleted_count} targets")
+    return ORJSONResponse({"message": f"Deleted {deleted_count} targets", "id": None})
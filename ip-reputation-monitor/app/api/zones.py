@@ -1,13 +1,19 @@
-"""API endpoints for zone (blacklist) management."""
+"""API endpoints for zone (blacklist) management.
 
-from typing import Optional
+Response models are built with model_construct: their fields come straight
+from database rows, so validation is only applied to request bodies.
+"""
+
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, delete, func, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.models.database import Zone
+from app.models.database import CheckResult, Zone
 from app.models.schemas import (
     ZoneCreate,
     ZoneUpdate,
@@ -15,17 +21,61 @@ from app.models.schemas import (
     ZoneListResponse,
     MessageResponse,
 )
+from app.services.monitoring import get_monitoring_service
 
 router = APIRouter(prefix="/zones", tags=["zones"])
 
+# Columns serialized for ZoneResponse
+ZONE_COLUMNS = (
+    Zone.id,
+    Zone.zone,
+    Zone.description,
+    Zone.enabled,
+    Zone.is_spamhaus,
+    Zone.created_at,
+    Zone.updated_at,
+)
+
+# Built once so the compiled SQL and its cache key are reused per request
+ZONE_BY_ID = select(*ZONE_COLUMNS).where(Zone.id == bindparam("zone_id"))
+
 
 def is_spamhaus_zone(zone: str) -> bool:
     """Check if a zone is a Spamhaus zone."""
-    return zone.lower() in [z.lower() for z in settings.SPAMHAUS_ZONES]
+    return zone.lower() in settings.spamhaus_zones_lower
 
 
-@router.post("", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
-async def create_zone(
+def seed_default_zones(db: Session) -> Tuple[int, int]:
+    """
+    Insert any missing default zones from settings.
+
+    Returns a tuple of (added, skipped) counts. The caller commits.
+    """
+    existing = set(
+        db.scalars(select(Zone.zone).where(Zone.zone.in_(settings.DEFAULT_ZONES))).all()
+    )
+    rows = [
+        {
+            "zone": zone_name,
+            "description": "Default DNSBL zone",
+            "enabled": True,
+            "is_spamhaus": is_spamhaus_zone(zone_name),
+        }
+        for zone_name in settings.DEFAULT_ZONES
+        if zone_name not in existing
+    ]
+    if rows:
+        db.execute(insert(Zone), rows)
+    return len(rows), len(existing)
+
+
+@router.post(
+    "",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": MessageResponse}},
+)
+def create_zone(
     request: ZoneCreate,
     db: Session = Depends(get_db),
 ):
@@ -45,21 +95,28 @@ async def create_zone(
             detail=f"Zone {request.zone} already exists",
         )
 
-    # Create new zone
-    zone = Zone(
-        zone=request.zone,
-        description=request.description,
-        enabled=request.enabled,
-        is_spamhaus=is_spamhaus_zone(request.zone),
+    # Create new zone; RETURNING hands back the id, so reading it after the
+    # commit does not reload the expired instance
+    zone_id = db.scalar(
+        insert(Zone)
+        .values(
+            zone=request.zone,
+            description=request.description,
+            enabled=request.enabled,
+            is_spamhaus=is_spamhaus_zone(request.zone),
+        )
+        .returning(Zone.id)
     )
-    db.add(zone)
     db.commit()
 
-    return MessageResponse(message=f"Zone {request.zone} created successfully", id=zone.id)
+    return ORJSONResponse(
+        {"message": f"Zone {request.zone} created successfully", "id": zone_id},
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
-@router.get("", response_model=ZoneListResponse)
-async def list_zones(
+@router.get("", response_model=None, responses={200: {"model": ZoneListResponse}})
+def list_zones(
     enabled_filter: bool = Query(None, description="Filter by enabled status"),
     search: Optional[str] = Query(None, description="Search by zone or description"),
     offset: int = Query(0, ge=0),
@@ -75,7 +132,8 @@ async def list_zones(
     - offset: Pagination offset (default: 0)
     - limit: Results per page (default: 100, max: 1000)
     """
-    query = db.query(Zone)
+    # The window count returns the filtered total alongside each page row
+    query = db.query(*ZONE_COLUMNS, func.count().over().label("total"))
 
     # Apply filters
     if enabled_filter is not None:
@@ -86,15 +144,20 @@ async def list_zones(
             (Zone.zone.ilike(f"%{search}%")) | (Zone.description.ilike(f"%{search}%"))
         )
 
-    # Get total count
-    total = query.count()
-
     # Apply pagination
     items = query.order_by(Zone.zone).offset(offset).limit(limit).all()
 
+    # An empty page past the end carries no total, so count separately
+    if items:
+        total = items[0].total
+    elif offset:
+        total = query.with_entities(func.count(Zone.id)).scalar()
+    else:
+        total = 0
+
     # Convert to response models
     response_items = [
-        ZoneResponse(
+        ZoneResponse.model_construct(
             id=item.id,
             zone=item.zone,
             description=item.description,
@@ -106,23 +169,25 @@ async def list_zones(
         for item in items
     ]
 
-    return ZoneListResponse(total=total, items=response_items)
+    # Serialize directly instead of through response_model
+    payload = ZoneListResponse.model_construct(total=total, items=response_items)
+    return ORJSONResponse(payload.model_dump(mode="json"))
 
 
-@router.get("/{zone_id}", response_model=ZoneResponse)
-async def get_zone(
+@router.get("/{zone_id}", response_model=None, responses={200: {"model": ZoneResponse}})
+def get_zone(
     zone_id: int,
     db: Session = Depends(get_db),
 ):
     """Get a specific zone by ID."""
-    zone = db.query(Zone).filter(Zone.id == zone_id).first()
+    zone = db.execute(ZONE_BY_ID, {"zone_id": zone_id}).first()
     if not zone:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Zone {zone_id} not found",
         )
 
-    return ZoneResponse(
+    payload = ZoneResponse.model_construct(
         id=zone.id,
         zone=zone.zone,
         description=zone.description,
@@ -131,10 +196,11 @@ async def get_zone(
         created_at=zone.created_at,
         updated_at=zone.updated_at,
     )
+    return ORJSONResponse(payload.model_dump(mode="json"))
 
 
 @router.patch("/{zone_id}", response_model=ZoneResponse)
-async def update_zone(
+def update_zone(
     zone_id: int,
     request: ZoneUpdate,
     db: Session = Depends(get_db),
@@ -146,24 +212,34 @@ async def update_zone(
     - description: Optional new description
     - enabled: Optional enabled status
     """
-    zone = db.query(Zone).filter(Zone.id == zone_id).first()
+    # Update fields
+    changes = {}
+    if request.description is not None:
+        changes["description"] = request.description
+
+    if request.enabled is not None:
+        changes["enabled"] = request.enabled
+
+    # UPDATE ... RETURNING fetches the updated row in the same statement
+    if changes:
+        zone = db.execute(
+            update(Zone)
+            .where(Zone.id == zone_id)
+            .values(**changes)
+            .returning(*ZONE_COLUMNS)
+        ).first()
+    else:
+        zone = db.execute(ZONE_BY_ID, {"zone_id": zone_id}).first()
+
     if not zone:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Zone {zone_id} not found",
         )
 
-    # Update fields
-    if request.description is not None:
-        zone.description = request.description
-
-    if request.enabled is not None:
-        zone.enabled = request.enabled
-
     db.commit()
-    db.refresh(zone)
 
-    return ZoneResponse(
+    return ZoneResponse.model_construct(
         id=zone.id,
         zone=zone.zone,
         description=zone.description,
@@ -174,53 +250,47 @@ async def update_zone(
     )
 
 
-@router.delete("/{zone_id}", response_model=MessageResponse)
-async def delete_zone(
+@router.delete("/{zone_id}", response_model=None, responses={200: {"model": MessageResponse}})
+def delete_zone(
     zone_id: int,
     db: Session = Depends(get_db),
 ):
     """Delete a zone."""
-    zone = db.query(Zone).filter(Zone.id == zone_id).first()
-    if not zone:
+    # Core DELETEs bypass the ORM cascade, so remove check results explicitly
+    affected_target_ids = db.scalars(
+        delete(CheckResult)
+        .where(CheckResult.zone_id == zone_id)
+        .returning(CheckResult.target_id)
+    ).all()
+    zone_name = db.scalar(delete(Zone).where(Zone.id == zone_id).returning(Zone.zone))
+    if zone_name is None:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Zone {zone_id} not found",
         )
 
-    zone_name = zone.zone
-    db.delete(zone)
+    # The status views read pre-aggregated counts, which included this zone
+    monitoring_service = get_monitoring_service()
+    if affected_target_ids:
+        monitoring_service.refresh_latest_status(db, list(set(affected_target_ids)))
     db.commit()
+    monitoring_service.clear_status_cache()
 
-    return MessageResponse(message=f"Zone {zone_name} deleted successfully")
+    return ORJSONResponse({"message": f"Zone {zone_name} deleted successfully", "id": None})
 
 
-@router.post("/default/initialize", response_model=MessageResponse)
-async def initialize_default_zones(db: Session = Depends(get_db)):
+@router.post("/default/initialize", response_model=None, responses={200: {"model": MessageResponse}})
+def initialize_default_zones(db: Session = Depends(get_db)):
     """
     Initialize default DNSBL zones from configuration.
 
     This endpoint adds all default zones from settings if they don't already exist.
     """
-    added_count = 0
-    skipped_count = 0
-
-    for zone_name in settings.DEFAULT_ZONES:
-        existing = db.query(Zone).filter(Zone.zone == zone_name).first()
-        if existing:
-            skipped_count += 1
-            continue
-
-        zone = Zone(
-            zone=zone_name,
-            description="Default DNSBL zone",
-            enabled=True,
-            is_spamhaus=is_spamhaus_zone(zone_name),
-        )
-        db.add(zone)
-        added_count += 1
-
+    added_count, skipped_count = seed_default_zones(db)
     db.commit()
 
-    return MessageResponse(
-        message=f"Added {added_count} default zones, skipped {skipped_count} existing zones"
-    )
+    return ORJSONResponse({
+        "message": f"Added {added_count} default zones, skipped {skipped_count} existing zones",
+        "id": None,
+    })
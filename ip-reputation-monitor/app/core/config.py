@@ -1,6 +1,7 @@
 """Configuration management for IP Reputation Monitor."""
 
-from typing import List
+from functools import cached_property
+from typing import FrozenSet, List, Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -37,10 +38,14 @@ class Settings(BaseSettings):
     # Cache Settings
     CACHE_TTL_MINUTES: int = 60
     CACHE_MAX_SIZE: int = 10000
+    NEGATIVE_CACHE_CAPACITY: int = 0  # not-listed answers held in the bloom filter; 0 disables it
+    NEGATIVE_CACHE_ERROR_RATE: float = 0.001
 
     # Rate Limiting Settings
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_BURST: int = 10
+    RATE_LIMIT_STRATEGY: str = "moving-window"  # moving-window or fixed-window
+    RATE_LIMIT_STORAGE_URI: str = "memory://"  # e.g. redis://localhost:6379/0
 
     # Scheduler Settings
     SCHEDULER_ENABLED: bool = True
@@ -54,6 +59,8 @@ class Settings(BaseSettings):
     REPORTS_DIR: str = "./reports"
     REPORT_RETENTION_DAYS: int = 30
     REPORT_MAX_ROWS: int = 50000
+    USE_XACCEL: bool = False  # Let nginx serve downloads via X-Accel-Redirect
+    XACCEL_REPORTS_PREFIX: str = "/protected-reports/"
 
     # CORS Settings
     CORS_ORIGINS: List[str] = ["*"]
@@ -63,7 +70,7 @@ class Settings(BaseSettings):
     LOG_FORMAT: str = "json"  # json or text
 
     # Default Blacklist Zones
-    DEFAULT_ZONES: List[str] = [
+    DEFAULT_ZONES: Tuple[str, ...] = (
         "all.s5h.net",
         "b.barracudacentral.org",
         "bl.spamcop.net",
@@ -119,15 +126,20 @@ class Settings(BaseSettings):
         "z.mailspike.net",
         "zen.spamhaus.org",
         "zombie.dnsbl.sorbs.net",
-    ]
+    )
 
     # Spamhaus Special Zones for BLOCKED handling
-    SPAMHAUS_ZONES: List[str] = [
+    SPAMHAUS_ZONES: Tuple[str, ...] = (
         "zen.spamhaus.org",
         "sbl.spamhaus.org",
         "xbl.spamhaus.org",
         "pbl.spamhaus.org",
-    ]
+    )
+
+    @cached_property
+    def spamhaus_zones_lower(self) -> FrozenSet[str]:
+        """Lowercased SPAMHAUS_ZONES for O(1) membership checks."""
+        return frozenset(z.lower() for z in self.SPAMHAUS_ZONES)
 
 
 settings = Settings()
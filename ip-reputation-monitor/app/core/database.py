@@ -1,21 +1,61 @@
 """Database connection and session management."""
 
 from contextlib import contextmanager
-from typing import Generator
-from sqlalchemy import create_engine
+
+import orjson
+from typing import Dict, Generator, List
+from sqlalchemy import Index, create_engine, delete, event, func, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.schema import DropIndex
 from app.core.config import settings
-from app.models.database import Base
+from app.models.database import (
+    Alert,
+    Base,
+    CheckResult,
+    Target,
+    TargetLatestStatus,
+    TargetTag,
+)
+
+# Indexes superseded by ones in the models, dropped from existing databases
+OBSOLETE_INDEXES = {
+    "targets": ("ix_targets_target", "idx_target_type"),
+}
 
 
-# Create engine
+# Dialect-specific batching for executemany INSERTs; the compiled-statement
+# cache is raised from its default of 500 so per-filter query variants fit
+database_url = make_url(settings.DATABASE_URL)
+engine_options = {"insertmanyvalues_page_size": 1000, "query_cache_size": 1200}
+if database_url.get_backend_name() == "sqlite":
+    engine_options["connect_args"] = {"check_same_thread": False}
+elif database_url.get_driver_name() == "psycopg2":
+    engine_options["executemany_mode"] = "values_plus_batch"
+    engine_options["executemany_batch_page_size"] = 1000
+
+# Create engine; JSON columns are (de)serialized with orjson
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     pool_pre_ping=True,
     pool_recycle=3600,
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
+    **engine_options,
 )
 
+
+if database_url.get_backend_name() == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL so bulk writes do not fsync the whole database on every commit."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -24,6 +64,57 @@ def init_db() -> None:
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
 
+    # create_all skips tables that already exist, so add indexes introduced
+    # since and drop the ones they replace
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing:
+                    continue
+                if index.name == "uq_target_target":
+                    _dedupe_targets(conn)
+                elif index.name == "uq_check_result_target_zone":
+                    _dedupe_check_results(conn)
+                index.create(conn)
+            for name in OBSOLETE_INDEXES.get(table.name, ()):
+                if name in existing:
+                    conn.execute(DropIndex(Index(name)))
+
+
+def _dedupe_targets(conn) -> None:
+    """Keep only the oldest target per address before enforcing uniqueness.
+
+    SQLite does not enforce the foreign keys here, so dependent rows are
+    removed (or, for alerts, detached) explicitly, as ON DELETE would.
+    """
+    oldest = select(func.min(Target.id)).group_by(Target.target)
+    stale_ids = conn.scalars(select(Target.id).where(Target.id.not_in(oldest))).all()
+    if not stale_ids:
+        return
+    for model in (CheckResult, TargetLatestStatus, TargetTag):
+        conn.execute(delete(model).where(model.target_id.in_(stale_ids)))
+    conn.execute(update(Alert).where(Alert.target_id.in_(stale_ids)).values(target_id=None))
+    conn.execute(delete(Target).where(Target.id.in_(stale_ids)))
+
+
+def _dedupe_check_results(conn) -> None:
+    """Keep only the most recently checked result per (target, zone) before enforcing uniqueness.
+
+    The old save path kept updating whichever duplicate it found first, so
+    the highest id is not necessarily current; last_checked is.
+    """
+    ranked = select(
+        CheckResult.id,
+        func.row_number().over(
+            partition_by=(CheckResult.target_id, CheckResult.zone_id),
+            order_by=(CheckResult.last_checked.desc(), CheckResult.id.desc()),
+        ).label("rn"),
+    ).subquery()
+    stale = select(ranked.c.id).where(ranked.c.rn > 1)
+    conn.execute(delete(CheckResult).where(CheckResult.id.in_(stale)))
+
 
 def get_db() -> Generator[Session, None, None]:
     """Dependency to get database session."""
@@ -34,6 +125,44 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def upsert(db: Session, model, rows: List[Dict], index_elements: List[str]) -> None:
+    """
+    Insert rows, updating the remaining columns of rows that already exist.
+
+    Uses INSERT ... ON CONFLICT DO UPDATE on SQLite and PostgreSQL, which
+    requires a unique index on index_elements. Other dialects fall back to
+    selecting each row by its index_elements and updating the loaded object
+    in place, or adding a new one; Session.merge is not used because it
+    matches on the primary key, which these rows do not carry.
+    """
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(model)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(model)
+    else:
+        for row in rows:
+            existing = db.scalars(
+                select(model).filter_by(**{c: row[c] for c in index_elements})
+            ).first()
+            if existing is None:
+                db.add(model(**row))
+            else:
+                for column, value in row.items():
+                    setattr(existing, column, value)
+        return
+
+    update_columns = [c for c in rows[0] if c not in index_elements]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={c: stmt.excluded[c] for c in update_columns},
+    )
+    db.execute(stmt, rows)
+
+
 @contextmanager
 def get_db_context() -> Generator[Session, None, None]:
     """Context manager for database session."""
@@ -3,50 +3,62 @@
 import logging
 import sys
 from contextlib import asynccontextmanager
+from types import SimpleNamespace
 from typing import Dict
 
+import orjson
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from pythonjsonlogger import jsonlogger
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from app.api.check import router as check_router
-from app.api.targets import router as targets_router
-from app.api.zones import router as zones_router
+from app.api.targets import router as targets_router, backfill_target_tags
+from app.api.zones import router as zones_router, seed_default_zones
 from app.api.monitor import router as monitor_router
 from app.api.status import router as status_router
 from app.api.metrics import router as metrics_router
 from app.api.reports import router as reports_router
 from app.core.config import settings
 from app.core.database import init_db, get_db_context
-from app.models.database import Target, Zone
+from app.models.database import CheckResult, Target, TargetLatestStatus, TargetTag, Zone
 from app.services.monitoring import get_monitoring_service
 from app.services.reports import get_report_service
 
+LOG_LEVEL = getattr(logging, settings.LOG_LEVEL.upper())
+
+
+class ORJSONFormatter(jsonlogger.JsonFormatter):
+    """JSON log formatter that serializes records with orjson."""
+
+    def jsonify_log_record(self, log_record):
+        return orjson.dumps(log_record, default=str).decode()
+
+
 # Configure logging
 def setup_logging():
     """Configure logging based on settings."""
     if settings.LOG_FORMAT == "json":
-        from pythonjsonlogger import jsonlogger
-
         handler = logging.StreamHandler(sys.stdout)
-        formatter = jsonlogger.JsonFormatter(
+        formatter = ORJSONFormatter(
             "%(asctime)s %(name)s %(levelname)s %(message)s",
             timestamp=True,
         )
         handler.setFormatter(formatter)
         logging.basicConfig(
-            level=getattr(logging, settings.LOG_LEVEL.upper()),
+            level=LOG_LEVEL,
             handlers=[handler],
         )
     else:
         logging.basicConfig(
-            level=getattr(logging, settings.LOG_LEVEL.upper()),
+            level=LOG_LEVEL,
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         )
 
@@ -72,20 +84,38 @@ async def lifespan(app: FastAPI):
 
     # Initialize default zones if none exist
     with get_db_context() as db:
-        zone_count = db.query(Zone).count()
-        if zone_count == 0:
+        if db.query(Zone).first() is None:
             logger.info("Initializing default DNSBL zones...")
-            for zone_name in settings.DEFAULT_ZONES:
-                is_spamhaus = zone_name in [z.lower() for z in settings.SPAMHAUS_ZONES]
-                zone = Zone(
-                    zone=zone_name,
-                    description="Default DNSBL zone",
-                    enabled=True,
-                    is_spamhaus=is_spamhaus,
-                )
-                db.add(zone)
+            added_count, _ = seed_default_zones(db)
+            db.commit()
+            logger.info(f"Initialized {added_count} default zones")
+
+    # Render the static UI pages once
+    app.state.static_pages = render_static_pages()
+
+    # Build service singletons up front so the first request does not pay
+    # for resolver and report directory setup
+    monitoring_service = get_monitoring_service()
+    get_report_service()
+
+    # Backfill the pre-aggregated status table for databases created before it
+    with get_db_context() as db:
+        if (
+            db.query(TargetLatestStatus).first() is None
+            and db.query(CheckResult).first() is not None
+        ):
+            logger.info("Backfilling target latest status...")
+            monitoring_service.refresh_latest_status(db)
+            db.commit()
+
+        # Likewise for the tag index table
+        if (
+            db.query(TargetTag).first() is None
+            and db.query(Target).filter(Target.tags.is_not(None)).first() is not None
+        ):
+            logger.info("Backfilling target tags...")
+            backfill_target_tags(db)
             db.commit()
-            logger.info(f"Initialized {len(settings.DEFAULT_ZONES)} default zones")
 
     # Start scheduler
     if settings.SCHEDULER_ENABLED:
@@ -107,15 +137,38 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down...")
     if settings.SCHEDULER_ENABLED:
         scheduler.shutdown()
+    await monitoring_service.aclose()
     logger.info("Application stopped")
 
 
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves the given paths uncompressed."""
+
+    def __init__(self, app, exclude_paths=(), **kwargs):
+        super().__init__(app, **kwargs)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="IP Reputation Monitor - DNSBL blacklist monitoring system",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Compress larger responses, but serve Prometheus scrapes as-is
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=1024,
+    exclude_paths=[f"{settings.API_PREFIX}/metrics"],
 )
 
 # Add CORS middleware
@@ -137,6 +190,26 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 # Setup templates
 templates = Jinja2Templates(directory="app/templates")
 
+# UI pages are static shells that load their data from the API, so each is
+# rendered once at startup; only the nav highlight depends on the path
+STATIC_PAGES = {
+    "/": "dashboard.html",
+    "/targets": "targets.html",
+    "/zones": "zones.html",
+    "/reports": "reports.html",
+}
+STATIC_PAGE_HEADERS = {"Cache-Control": "public, max-age=60"}
+
+
+def render_static_pages() -> Dict[str, str]:
+    """Render each UI page for its own path."""
+    return {
+        path: templates.get_template(name).render(
+            request=SimpleNamespace(url=SimpleNamespace(path=path))
+        )
+        for path, name in STATIC_PAGES.items()
+    }
+
 
 # Include API routers
 app.include_router(check_router, prefix=settings.API_PREFIX)
@@ -153,25 +226,25 @@ app.include_router(reports_router, prefix=settings.API_PREFIX)
 @app.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
     """Dashboard home page."""
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+    return HTMLResponse(request.app.state.static_pages["/"], headers=STATIC_PAGE_HEADERS)
 
 
 @app.get("/targets", response_class=HTMLResponse)
 async def targets_page(request: Request):
     """Targets management page."""
-    return templates.TemplateResponse("targets.html", {"request": request})
+    return HTMLResponse(request.app.state.static_pages["/targets"], headers=STATIC_PAGE_HEADERS)
 
 
 @app.get("/zones", response_class=HTMLResponse)
 async def zones_page(request: Request):
     """Zones management page."""
-    return templates.TemplateResponse("zones.html", {"request": request})
+    return HTMLResponse(request.app.state.static_pages["/zones"], headers=STATIC_PAGE_HEADERS)
 
 
 @app.get("/reports", response_class=HTMLResponse)
 async def reports_page(request: Request):
     """Reports page."""
-    return templates.TemplateResponse("reports.html", {"request": request})
+    return HTMLResponse(request.app.state.static_pages["/reports"], headers=STATIC_PAGE_HEADERS)
 
 
 # ===== Scheduler Job =====
@@ -26,24 +26,50 @@ class Target(Base):
     __tablename__ = "targets"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    target: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
+    target: Mapped[str] = mapped_column(String(255), nullable=False)
     type: Mapped[str] = mapped_column(String(10), nullable=False, default="ip")  # 'ip' or 'domain'
     label: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    tags: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON string array
+    tags: Mapped[Optional[list]] = mapped_column(JSON(none_as_null=True), nullable=True)
     enabled: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
-    # Relationships
+    # Relationships. Code reading check_results for more than one target must
+    # load them with .options(selectinload(Target.check_results)).
     check_results: Mapped[list["CheckResult"]] = relationship(
         "CheckResult", back_populates="target", cascade="all, delete-orphan"
     )
+    latest_status: Mapped[Optional["TargetLatestStatus"]] = relationship(
+        "TargetLatestStatus", cascade="all, delete-orphan", uselist=False
+    )
+    tag_rows: Mapped[list["TargetTag"]] = relationship(
+        "TargetTag", cascade="all, delete-orphan"
+    )
 
     __table_args__ = (
+        # Named apart from the old non-unique ix_targets_target so init_db
+        # creates it on existing databases
+        Index("uq_target_target", "target", unique=True),
         Index("idx_target_enabled", "enabled"),
-        Index("idx_target_type", "type"),
+        Index("idx_target_type_enabled", "type", "enabled"),
+        Index("idx_target_created_at", "created_at"),
+    )
+
+
+class TargetTag(Base):
+    """One tag of a target; mirrors Target.tags so tag filters can use an index."""
+
+    __tablename__ = "target_tags"
+
+    target_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("targets.id", ondelete="CASCADE"), primary_key=True
+    )
+    tag: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    __table_args__ = (
+        Index("idx_target_tag_tag", "tag"),
     )
 
 
@@ -89,8 +115,8 @@ class CheckResult(Base):
     status: Mapped[str] = mapped_column(String(20), nullable=False, index=True)  # 'listed', 'not_listed', 'error', 'blocked'
 
     # DNS responses
-    a_records: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON string array
-    txt_records: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON string array
+    a_records: Mapped[Optional[list]] = mapped_column(JSON(none_as_null=True), nullable=True)
+    txt_records: Mapped[Optional[list]] = mapped_column(JSON(none_as_null=True), nullable=True)
 
     # Error information
     error_reason: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
@@ -104,18 +130,49 @@ class CheckResult(Base):
         Integer, ForeignKey("monitor_runs.id", ondelete="SET NULL"), nullable=True
     )
 
-    # Relationships
-    target: Mapped["Target"] = relationship("Target", back_populates="check_results")
-    zone: Mapped["Zone"] = relationship("Zone", back_populates="check_results")
-    run: Mapped[Optional["MonitorRun"]] = relationship("MonitorRun", back_populates="check_results")
+    # Relationships. Lazy loads raise: join Target/Zone in the query, or use
+    # joinedload()/selectinload(), instead of loading them one row at a time.
+    target: Mapped["Target"] = relationship("Target", back_populates="check_results", lazy="raise")
+    zone: Mapped["Zone"] = relationship("Zone", back_populates="check_results", lazy="raise")
+    run: Mapped[Optional["MonitorRun"]] = relationship(
+        "MonitorRun", back_populates="check_results", lazy="raise"
+    )
 
     __table_args__ = (
         Index("idx_check_result_status", "status"),
-        Index("idx_check_result_target_zone", "target_id", "zone_id", unique=False),
-        Index("idx_check_result_last_seen", "last_seen"),
+        # One row per (target, zone), which the monitoring upsert relies on; on
+        # PostgreSQL status and last_seen are carried in the index so
+        # per-pair reads are index-only
+        Index(
+            "uq_check_result_target_zone",
+            "target_id",
+            "zone_id",
+            unique=True,
+            postgresql_include=["status", "last_seen"],
+        ),
+        Index("idx_check_result_target_last_checked", "target_id", "last_checked"),
+        # Newest-issues-per-target ranking in the status view; read backwards for DESC
+        Index("idx_check_result_target_last_seen", "target_id", "last_seen"),
+        # Report scope is one run; status and target_id let blocked-target
+        # lookups stay inside the index
+        Index("idx_check_result_run_status_target", "run_id", "status", "target_id"),
     )
 
 
+class TargetLatestStatus(Base):
+    """Pre-aggregated issue counts per target, refreshed by each monitoring run."""
+
+    __tablename__ = "target_latest_status"
+
+    target_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("targets.id", ondelete="CASCADE"), primary_key=True
+    )
+    listed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    blocked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_checked: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
 class MonitorRun(Base):
     """Represents a scheduled or manual monitoring run."""
 
@@ -142,10 +199,12 @@ class MonitorRun(Base):
     duration_seconds: Mapped[Optional[float]] = mapped_column(Integer, nullable=True)
 
     # Metadata
-    run_metadata: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
+    run_metadata: Mapped[Optional[dict]] = mapped_column(JSON(none_as_null=True), nullable=True)
 
-    # Relationships
-    check_results: Mapped[list["CheckResult"]] = relationship("CheckResult", back_populates="run")
+    # Relationships. Never loaded; run results are aggregated with explicit queries.
+    check_results: Mapped[list["CheckResult"]] = relationship(
+        "CheckResult", back_populates="run", lazy="noload"
+    )
 
     __table_args__ = (
         Index("idx_monitor_run_started_at", "started_at"),
@@ -181,7 +240,7 @@ class Report(Base):
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     # Metadata
-    report_metadata: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
+    report_metadata: Mapped[Optional[dict]] = mapped_column(JSON(none_as_null=True), nullable=True)
 
     __table_args__ = (
         Index("idx_report_created_at", "created_at"),
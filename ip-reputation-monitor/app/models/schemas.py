@@ -223,6 +223,7 @@ class ReportCreate(BaseModel):
     target_ids: Optional[List[int]] = Field(None)
     zone_ids: Optional[List[int]] = Field(None)
     status_filter: Optional[str] = Field(None, pattern="^(listed|blocked|error|all)$")
+    compress: bool = Field(False, description="Gzip CSV output (.csv.gz)")
 
 
 class ReportResponse(BaseModel):
@@ -1,23 +1,65 @@
 """DNSBL checker service with async DNS queries, caching, and rate limiting."""
 
 import asyncio
-import ipaddress
-import json
-from collections import defaultdict
+import itertools
+import math
+import operator
+import re
+import struct
+import time
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Dict, List, Optional, Set, Tuple
 
+import dns.asyncquery
 import dns.asyncresolver
+import dns.entropy
+import dns.flags
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
+import dns.resolver
 from cachetools import TTLCache
 from dns.exception import DNSException
-from dns.resolver import NXDOMAIN, NoAnswer, Timeout
+from dns.resolver import NoAnswer, Timeout
 
 from app.core.config import settings
 
+# Base delay before retrying a timed-out query; doubles on each attempt
+DNS_RETRY_BACKOFF_SEC = 0.25
 
-@dataclass
+# Record types queried; shared objects so cache-key tuples hash and compare cheaply
+RRTYPE_A = "A"
+RRTYPE_TXT = "TXT"
+
+# Record text extraction; A rdata already holds its address as a string
+RDATA_ADDRESS = operator.attrgetter("address")
+RDATA_TEXT = operator.methodcaller("to_text")
+
+# Cached stand-in for any lookup the negative filter remembers as not listed
+NEGATIVE_RESULT = {"status": "nxdomain", "records": []}
+
+# Dotted-quad IPv4 address, matching what ipaddress.IPv4Address accepts
+# (no leading zeros) without raising on every domain target
+_OCTET = r"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
+IPV4_RE = re.compile(rf"(?:{_OCTET}\.){{3}}{_OCTET}")
+
+# Spamhaus return-code ranges (127.255.255.0/24 and 127.0.0.0/24); A records
+# come back as canonical dotted quads, so a prefix test is an exact /24 match
+SPAMHAUS_BLOCKED_PREFIX = "127.255.255."
+SPAMHAUS_LISTED_PREFIX = "127.0.0."
+
+# Wire format for outgoing queries: 16-bit ID, then flags (RD) and section
+# counts (one question), then the question section itself
+QUERY_ID = struct.Struct("!H")
+QUERY_HEADER_TAIL = struct.pack("!HHHHH", dns.flags.RD, 1, 0, 0, 0)
+RESPONSE_HEADER = struct.Struct("!HH")
+
+
+@dataclass(slots=True)
 class CheckResult:
     """Result of a DNSBL check."""
     zone: str
@@ -27,7 +69,7 @@ class CheckResult:
     error_reason: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TargetResult:
     """Aggregate results for a target."""
     target: str
@@ -38,35 +80,219 @@ class TargetResult:
     not_listed_zones_count: int
 
 
+class DNSQueryProtocol(asyncio.DatagramProtocol):
+    """Shared UDP endpoint that matches DNS responses to in-flight queries by transaction ID."""
+
+    def __init__(self, nameserver: str):
+        self.nameserver = nameserver
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        # query ID -> (lower-cased question section, future)
+        self.pending: Dict[int, Tuple[bytes, asyncio.Future]] = {}
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+
+    def send(self, question: bytes, timeout: float) -> asyncio.Future:
+        """Send a query for a wire-format question section.
+
+        Returns a future resolved with the response, or failed with Timeout.
+        """
+        # Transaction IDs must be unique among queries still in flight on this socket
+        query_id = dns.entropy.random_16()
+        while query_id in self.pending:
+            query_id = dns.entropy.random_16()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending[query_id] = (question.lower(), future)
+        self.transport.sendto(QUERY_ID.pack(query_id) + QUERY_HEADER_TAIL + question)
+
+        handle = loop.call_later(timeout, self._expire, query_id, future)
+        future.add_done_callback(lambda _: handle.cancel())
+        return future
+
+    def _expire(self, query_id: int, future: asyncio.Future) -> None:
+        entry = self.pending.get(query_id)
+        if entry is not None and entry[1] is future:
+            del self.pending[query_id]
+        if not future.done():
+            future.set_exception(Timeout())
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        if len(data) < 12:
+            return
+        query_id, flags = RESPONSE_HEADER.unpack_from(data)
+        entry = self.pending.get(query_id)
+        if entry is None:
+            return
+        question, future = entry
+        # Ignore stray datagrams that reuse an ID but do not answer our question
+        if not flags & dns.flags.QR or data[12:12 + len(question)].lower() != question:
+            return
+        del self.pending[query_id]
+        if future.done():
+            return
+
+        try:
+            future.set_result(dns.message.from_wire(data))
+        except DNSException as e:
+            future.set_exception(e)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP errors cannot be tied to a single query, so fail everything in flight
+        self._fail_pending(exc)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._fail_pending(exc or ConnectionError("DNS socket closed"))
+
+    def _fail_pending(self, exc: Exception) -> None:
+        pending, self.pending = self.pending, {}
+        for _, future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+
 class RateLimiter:
-    """Per-zone rate limiter."""
+    """Per-zone token-bucket rate limiter."""
 
     def __init__(self, max_requests_per_second: int = 10):
         self.max_requests = max_requests_per_second
-        self.requests: Dict[str, List[float]] = defaultdict(list)
-        self._lock = asyncio.Lock()
+        # zone -> (tokens, time of last refill); single-threaded event loop, so no lock
+        self.buckets: Dict[str, Tuple[float, float]] = {}
 
     async def acquire(self, zone: str) -> None:
         """Acquire permission to query a zone."""
-        async with self._lock:
-            now = datetime.now().timestamp()
-            # Clean old requests
-            cutoff = now - 1.0  # Keep only requests from the last second
-            self.requests[zone] = [t for t in self.requests[zone] if t > cutoff]
-
-            if len(self.requests[zone]) >= self.max_requests:
-                # Wait until we can make a request
-                sleep_time = self.requests[zone][0] - cutoff
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-                    # Clean again after sleeping
-                    self.requests[zone] = [t for t in self.requests[zone] if t > cutoff]
-
-            self.requests[zone].append(now)
+        now = asyncio.get_running_loop().time()
+        tokens, last = self.buckets.get(zone, (self.max_requests, now))
+        tokens = min(self.max_requests, tokens + (now - last) * self.max_requests)
+
+        # Take the token even when the bucket is empty; the debt makes later
+        # callers wait their turn instead of all waking at once
+        self.buckets[zone] = (tokens - 1, now)
+        if tokens < 1:
+            await asyncio.sleep((1 - tokens) / self.max_requests)
+
+
+class FrequencySketch:
+    """Count-Min sketch of saturating 4-bit counters for TinyLFU admission."""
+
+    _DEPTH = 4
+    _MAX_COUNT = 15
+
+    def __init__(self, capacity: int):
+        self._width = max(64, capacity * 10)
+        self._table = [bytearray(self._width) for _ in range(self._DEPTH)]
+        # Halve all counters after this many increments so stale popularity ages out
+        self._sample_size = self._width
+        self._additions = 0
+
+    def _indexes(self, key) -> List[int]:
+        h = hash(key)
+        return [hash((h, seed)) % self._width for seed in range(self._DEPTH)]
+
+    def frequency(self, key) -> int:
+        """Estimate how often a key has been seen."""
+        return min(row[i] for row, i in zip(self._table, self._indexes(key)))
+
+    def increment(self, key) -> None:
+        """Record one access to a key."""
+        for row, i in zip(self._table, self._indexes(key)):
+            if row[i] < self._MAX_COUNT:
+                row[i] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._table = [bytearray(c >> 1 for c in row) for row in self._table]
+            self._additions = 0
+
+
+class NegativeBloomFilter:
+    """Bloom filter remembering lookups that returned no listing.
+
+    Bloom filters cannot forget single keys, so the whole filter is cleared once
+    per TTL, and also once it holds ``capacity`` keys so the false-positive
+    rate never exceeds ``error_rate``.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, ttl: float):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._bits_count = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hash_count = max(1, round(self._bits_count / capacity * math.log(2)))
+        self._bits = bytearray((self._bits_count + 7) // 8)
+        self._started = time.monotonic()
+        self.size = 0
+        self.hits = 0
+
+    def _indexes(self, key):
+        # Double hashing: k probes from two base hashes
+        h1 = hash(key)
+        h2 = hash((h1, 1)) | 1
+        return ((h1 + i * h2) % self._bits_count for i in range(self._hash_count))
+
+    def _expire(self) -> None:
+        if time.monotonic() - self._started >= self.ttl:
+            self.clear()
+
+    def add(self, key) -> None:
+        """Remember a key."""
+        self._expire()
+        if self.size >= self.capacity:
+            self.clear()
+        for i in self._indexes(key):
+            self._bits[i >> 3] |= 1 << (i & 7)
+        self.size += 1
+
+    def __contains__(self, key) -> bool:
+        self._expire()
+        for i in self._indexes(key):
+            if not self._bits[i >> 3] & (1 << (i & 7)):
+                return False
+        self.hits += 1
+        return True
+
+    def clear(self) -> None:
+        """Forget every key."""
+        self._bits = bytearray(len(self._bits))
+        self._started = time.monotonic()
+        self.size = 0
+
+
+class TinyLFUCache(TTLCache):
+    """TTL cache that only admits a new key when it is used more often than the entry it would evict."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._sketch = FrequencySketch(maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        self._sketch.increment(key)
+        if key in self:
+            self.hits += 1
+            return self[key]
+        self.misses += 1
+        return default
+
+    def __setitem__(self, key, value):
+        if key not in self and len(self) >= self.maxsize:
+            self.expire()
+            if len(self) >= self.maxsize:
+                # Oldest entry is the eviction candidate
+                victim = next(iter(self))
+                if self._sketch.frequency(key) <= self._sketch.frequency(victim):
+                    return
+                del self[victim]
+        super().__setitem__(key, value)
 
 
 class DNSBLChecker:
-    """DNSBL checker with caching and rate limiting."""
+    """
+    DNSBL checker with caching and rate limiting.
+
+    The fan-out is dominated by event-loop scheduling, so uvloop is recommended;
+    uvicorn picks it automatically when it is installed.
+    """
 
     def __init__(
         self,
@@ -75,18 +301,26 @@ class DNSBLChecker:
         per_zone_rate_limit: int = None,
         timeout_ms: int = None,
         dns_nameservers: List[str] = None,
+        max_retries: int = None,
     ):
         self.ttl_minutes = ttl_minutes or settings.CACHE_TTL_MINUTES
         self.cache_ttl = timedelta(minutes=self.ttl_minutes)
         self.max_cache_size = max_cache_size or settings.CACHE_MAX_SIZE
 
         # Cache: (target, zone, rrtype) -> result
-        self._cache: TTLCache = TTLCache(
+        self._cache: TinyLFUCache = TinyLFUCache(
             maxsize=self.max_cache_size,
             ttl=self.cache_ttl.total_seconds(),
         )
-
-        self._cache_lock = asyncio.Lock()
+        # Optional compact store for not-listed answers; its false positives
+        # can hide a listing, so it is off unless a capacity is configured
+        self._negative: Optional[NegativeBloomFilter] = None
+        if settings.NEGATIVE_CACHE_CAPACITY > 0:
+            self._negative = NegativeBloomFilter(
+                capacity=settings.NEGATIVE_CACHE_CAPACITY,
+                error_rate=settings.NEGATIVE_CACHE_ERROR_RATE,
+                ttl=self.cache_ttl.total_seconds(),
+            )
 
         # Rate limiter
         self.per_zone_rate_limit = per_zone_rate_limit or settings.DNS_PER_ZONE_RATE_LIMIT
@@ -95,9 +329,12 @@ class DNSBLChecker:
         # DNS resolver settings
         self.timeout_ms = timeout_ms or settings.DNS_TIMEOUT_MS
         self.dns_nameservers = dns_nameservers or settings.DNS_NAMESERVERS
+        self.max_retries = max_retries if max_retries is not None else settings.DNS_MAX_RETRIES
 
         # Spamhaus zones for special handling
         self.spamhaus_zones = set(settings.SPAMHAUS_ZONES)
+        # zone -> classifier; zones not listed here use _classify_standard
+        self._classifiers = {zone: self._classify_spamhaus for zone in self.spamhaus_zones}
 
         # Create resolver
         self.resolver = dns.asyncresolver.Resolver()
@@ -106,105 +343,244 @@ class DNSBLChecker:
         self.resolver.timeout = self.timeout_ms / 1000.0
         self.resolver.lifetime = self.timeout_ms / 1000.0
 
-    def _make_cache_key(self, target: str, zone: str, rrtype: str) -> str:
+        # Pool of UDP endpoints, opened lazily on the running event loop and
+        # handed out round-robin; endpoint i talks to nameserver i mod N
+        pool_size = min(16, max(1, settings.DNS_CONCURRENCY // 32))
+        self._endpoint_tasks: List[Optional[asyncio.Task]] = [None] * pool_size
+        self._endpoint_rr = itertools.cycle(range(pool_size))
+
+        # (zone, rdtype) -> wire-format zone name, QTYPE and QCLASS
+        self._question_suffixes: Dict[Tuple[str, int], bytes] = {}
+
+    def _make_cache_key(self, target: str, zone: str, rrtype: str) -> Tuple[str, str, str]:
         """Create cache key."""
-        return f"{target}:{zone}:{rrtype}"
+        return target, zone, rrtype
 
-    async def _get_cached(self, target: str, zone: str, rrtype: str) -> Optional[Dict]:
+    def _get_cached(self, target: str, zone: str, rrtype: str) -> Optional[Dict]:
         """Get cached result if available and not expired."""
+        # No await between lookup and return, so the event loop needs no lock here
         key = self._make_cache_key(target, zone, rrtype)
-        async with self._cache_lock:
-            return self._cache.get(key)
+        # Exact entries win; the filter is only consulted on a miss
+        result = self._cache.get(key)
+        if result is None and self._negative is not None and key in self._negative:
+            return NEGATIVE_RESULT
+        return result
 
-    async def _set_cache(self, target: str, zone: str, rrtype: str, result: Dict) -> None:
+    def _set_cache(self, target: str, zone: str, rrtype: str, result: Dict) -> None:
         """Set cached result."""
         key = self._make_cache_key(target, zone, rrtype)
-        async with self._cache_lock:
+        if self._negative is not None and result["status"] in ("nxdomain", "noanswer"):
+            # Not-listed answers dominate; keep them in the compact filter instead
+            self._negative.add(key)
+        else:
             self._cache[key] = result
 
     def _is_spamhaus_blocked(self, ip_str: str) -> bool:
         """Check if IP is in Spamhaus blocked range (127.255.255.x)."""
-        try:
-            ip = ipaddress.IPv4Address(ip_str)
-            return ip in ipaddress.IPv4Network("127.255.255.0/24")
-        except (ipaddress.AddressValueError, ValueError):
-            return False
+        return ip_str.startswith(SPAMHAUS_BLOCKED_PREFIX)
 
     def _is_spamhaus_listed(self, ip_str: str) -> bool:
         """Check if IP is in Spamhaus listed range (127.0.0.x)."""
-        try:
-            ip = ipaddress.IPv4Address(ip_str)
-            return ip in ipaddress.IPv4Network("127.0.0.0/24")
-        except (ipaddress.AddressValueError, ValueError):
-            return False
+        return ip_str.startswith(SPAMHAUS_LISTED_PREFIX)
+
+    async def _get_protocol(self) -> DNSQueryProtocol:
+        """Return the next pooled UDP endpoint, opening it on first use or after the loop changed."""
+        loop = asyncio.get_running_loop()
+        index = next(self._endpoint_rr)
+        task = self._endpoint_tasks[index]
+        if (
+            task is None
+            or task.get_loop() is not loop
+            or (task.done() and (
+                task.cancelled()
+                or task.exception() is not None
+                or task.result().transport.is_closing()
+            ))
+        ):
+            # Concurrent callers await the same task instead of opening several sockets
+            task = loop.create_task(self._open_endpoint(index))
+            self._endpoint_tasks[index] = task
+        return await task
+
+    async def _open_endpoint(self, index: int) -> DNSQueryProtocol:
+        """Open a UDP socket connected to the pool slot's nameserver."""
+        nameservers = self.resolver.nameservers
+        nameserver = nameservers[index % len(nameservers)]
+        _, protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: DNSQueryProtocol(nameserver),
+            remote_addr=(nameserver, self.resolver.port),
+        )
+        return protocol
+
+    def _question_suffix(self, zone: str, rdtype: dns.rdatatype.RdataType) -> bytes:
+        """Return the question-section bytes that follow the target's labels."""
+        key = (zone, rdtype)
+        suffix = self._question_suffixes.get(key)
+        if suffix is None:
+            suffix = dns.name.from_text(zone).to_wire() + struct.pack(
+                "!HH", rdtype, dns.rdataclass.IN
+            )
+            self._question_suffixes[key] = suffix
+        return suffix
 
-    async def _query_dns(
-        self, target: str, zone: str, rrtype: str = "A"
+    def _parse_response(
+        self, rdtype: dns.rdatatype.RdataType, response: dns.message.Message
     ) -> Tuple[str, List[str]]:
-        """Query DNS for target against zone."""
-        # Apply rate limiting
-        await self.rate_limiter.acquire(zone)
-
-        # Check cache first
-        cached = await self._get_cached(target, zone, rrtype)
-        if cached is not None:
-            return cached["status"], cached["records"]
+        """Map a DNS response to a (status, records) pair."""
+        rcode = response.rcode()
+        if rcode == dns.rcode.NXDOMAIN:
+            return "nxdomain", []
+        if rcode != dns.rcode.NOERROR:
+            return "error", []
 
         try:
-            # Build DNSBL query
-            if rrtype == "A":
-                query_target = self._build_dnsbl_query(target, zone)
-            else:
-                query_target = self._build_dnsbl_query(target, zone)
-
-            # Query DNS
-            answer = await self.resolver.resolve(query_target, rrtype)
+            answer = dns.resolver.Answer(
+                response.question[0].name, rdtype, dns.rdataclass.IN, response
+            )
+        except NoAnswer:
+            return "noanswer", []
 
-            # Extract records
-            records = [str(rdata) for rdata in answer]
+        extract = RDATA_ADDRESS if rdtype == dns.rdatatype.A else RDATA_TEXT
+        return "success", list(map(extract, answer))
 
-            # Cache result
-            await self._set_cache(target, zone, rrtype, {"status": "success", "records": records})
+    async def _batch_query(
+        self,
+        zone: str,
+        targets: List[str],
+        rrtype: str = RRTYPE_A,
+        timeout_ms: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        labels: Optional[Dict[str, Optional[bytes]]] = None,
+    ) -> Dict[str, Tuple[str, List[str]]]:
+        """Query many targets against one zone over one pooled UDP socket.
+
+        ``labels`` maps each target to its wire-format query labels (see
+        ``_query_labels``) so callers checking many zones encode them once.
+        """
+        lifetime = (timeout_ms or self.timeout_ms) / 1000.0
+        rdtype = dns.rdatatype.from_text(rrtype)
+        results: Dict[str, Tuple[str, List[str]]] = {}
+
+        # Serve what we can from the cache
+        misses = []
+        for target in targets:
+            # Apply rate limiting
+            await self.rate_limiter.acquire(zone)
+
+            cached = self._get_cached(target, zone, rrtype)
+            if cached is not None:
+                results[target] = cached["status"], cached["records"]
+            else:
+                misses.append(target)
 
-            return "success", records
+        if not misses:
+            return results
 
-        except NXDOMAIN:
-            # Not listed
-            await self._set_cache(target, zone, rrtype, {"status": "nxdomain", "records": []})
-            return "nxdomain", []
+        try:
+            protocol = await self._get_protocol()
+        except OSError:
+            for target in misses:
+                results[target] = "error", []
+            return results
+
+        if labels is None:
+            labels = {target: self._query_labels(target) for target in misses}
+        suffix = self._question_suffix(zone, rdtype)
+        questions = {}
+        for target in misses:
+            if labels[target] is None:
+                results[target] = "error", []
+            else:
+                questions[target] = labels[target] + suffix
+        to_send = list(questions)
+        responses: Dict[str, dns.message.Message] = {}
+
+        # Fire the whole burst, wait once, and retry timeouts with exponential backoff
+        attempt = 0
+        while True:
+            in_flight = {}
+            for target in to_send:
+                if semaphore is not None:
+                    await semaphore.acquire()
+                future = protocol.send(questions[target], lifetime)
+                if semaphore is not None:
+                    future.add_done_callback(lambda _: semaphore.release())
+                in_flight[target] = future
+
+            # Nothing to send when every miss had an unencodable name
+            if in_flight:
+                await asyncio.wait(in_flight.values())
+
+            to_send = []
+            for target, future in in_flight.items():
+                exc = future.exception()
+                if isinstance(exc, Timeout):
+                    to_send.append(target)
+                elif exc is not None:
+                    results[target] = "error", []
+                else:
+                    responses[target] = future.result()
+
+            if not to_send or attempt >= self.max_retries:
+                break
+            await asyncio.sleep(DNS_RETRY_BACKOFF_SEC * (2 ** attempt))
+            attempt += 1
+            for _ in to_send:
+                await self.rate_limiter.acquire(zone)
+
+        for target in to_send:
+            results[target] = "timeout", []
+
+        for target, response in responses.items():
+            if response.flags & dns.flags.TC:
+                # Answer did not fit in a datagram; repeat this one query over TCP
+                try:
+                    response = await dns.asyncquery.tcp(
+                        dns.message.make_query(response.question[0].name, rdtype),
+                        protocol.nameserver,
+                        timeout=lifetime,
+                        port=self.resolver.port,
+                    )
+                except Timeout:
+                    results[target] = "timeout", []
+                    continue
+                except (DNSException, OSError):
+                    results[target] = "error", []
+                    continue
+            results[target] = self._parse_response(rdtype, response)
 
-        except NoAnswer:
-            # Not listed for this record type
-            await self._set_cache(target, zone, rrtype, {"status": "noanswer", "records": []})
-            return "noanswer", []
+        # Cache result
+        for target in misses:
+            status, records = results[target]
+            self._set_cache(target, zone, rrtype, {"status": status, "records": records})
 
-        except Timeout:
-            # Timeout error
-            await self._set_cache(target, zone, rrtype, {"status": "timeout", "records": []})
-            return "timeout", []
+        return results
 
-        except DNSException as e:
-            # Other DNS errors
-            await self._set_cache(target, zone, rrtype, {"status": "error", "records": []})
-            return "error", []
+    async def _query_dns(
+        self, target: str, zone: str, rrtype: str = RRTYPE_A, timeout_ms: Optional[int] = None
+    ) -> Tuple[str, List[str]]:
+        """Query DNS for target against zone."""
+        results = await self._batch_query(zone, [target], rrtype, timeout_ms)
+        return results[target]
 
-    def _build_dnsbl_query(self, ip: str, zone: str) -> str:
-        """Build DNSBL query string for an IP."""
-        try:
-            ip_obj = ipaddress.IPv4Address(ip)
-            # Reverse the IP
-            octets = str(ip_obj).split(".")
-            reversed_ip = ".".join(reversed(octets))
-            return f"{reversed_ip}.{zone}"
-        except (ipaddress.AddressValueError, ValueError):
+    def _query_prefix(self, target: str) -> str:
+        """Return the label prepended to a zone when querying a target."""
+        if not IPV4_RE.fullmatch(target):
             # Invalid IP, return as-is for domain queries
-            return f"{ip}.{zone}"
+            return target
+        # Reverse the IP
+        return ".".join(reversed(target.split(".")))
 
-    async def check_zone(self, target: str, zone: str, include_txt: bool = False) -> CheckResult:
-        """Check a target against a single DNSBL zone."""
-        # Query A record
-        a_status, a_records = await self._query_dns(target, zone, "A")
+    def _query_labels(self, target: str) -> Optional[bytes]:
+        """Encode a target's query prefix as wire-format labels, or None if it is not a valid name."""
+        try:
+            # Drop the root label's terminating zero; the zone suffix supplies it
+            return dns.name.from_text(self._query_prefix(target)).to_wire()[:-1]
+        except DNSException:
+            return None
 
+    def _classify_standard(self, zone: str, a_status: str, a_records: List[str]) -> CheckResult:
+        """Turn the A lookup for one zone into a check result."""
         # Determine status
         if a_status in ["nxdomain", "noanswer"]:
             return CheckResult(
@@ -231,99 +607,155 @@ class DNSBLChecker:
                 txt_records=[],
             )
 
-        # Check for Spamhaus special handling
-        if zone in self.spamhaus_zones:
-            for a_record in a_records:
-                if self._is_spamhaus_blocked(a_record):
-                    return CheckResult(
-                        zone=zone,
-                        status="blocked",
-                        a_records=a_records,
-                        txt_records=[],
-                        error_reason="Blocked/limits",
-                    )
-
         # Listed
-        txt_records = []
-        if include_txt:
-            _, txt_records = await self._query_dns(target, zone, "TXT")
-
         return CheckResult(
             zone=zone,
             status="listed",
             a_records=a_records,
-            txt_records=txt_records,
+            txt_records=[],
         )
 
+    def _classify_spamhaus(self, zone: str, a_status: str, a_records: List[str]) -> CheckResult:
+        """Classify a Spamhaus answer, where 127.255.255.x means our query was refused."""
+        result = self._classify_standard(zone, a_status, a_records)
+        if result.status == "listed" and any(map(self._is_spamhaus_blocked, a_records)):
+            result.status = "blocked"
+            result.error_reason = "Blocked/limits"
+        return result
+
+    async def check_zone(
+        self,
+        target: str,
+        zone: str,
+        include_txt: bool = False,
+        timeout_ms: Optional[int] = None,
+    ) -> CheckResult:
+        """Check a target against a single DNSBL zone."""
+        # Query A record
+        a_status, a_records = await self._query_dns(target, zone, RRTYPE_A, timeout_ms)
+        result = self._classifiers.get(zone, self._classify_standard)(zone, a_status, a_records)
+
+        if include_txt and result.status == "listed":
+            _, result.txt_records = await self._query_dns(target, zone, RRTYPE_TXT, timeout_ms)
+
+        return result
+
+    async def _check_zone_batch(
+        self,
+        targets: List[str],
+        zone: str,
+        include_txt: bool,
+        timeout_ms: Optional[int],
+        semaphore: asyncio.Semaphore,
+        labels: Dict[str, Optional[bytes]],
+    ) -> Dict[str, CheckResult]:
+        """Check every target against one zone with a single burst of queries."""
+        a_results = await self._batch_query(zone, targets, RRTYPE_A, timeout_ms, semaphore, labels)
+        # Pick the zone's classifier once for the whole batch
+        classify = self._classifiers.get(zone, self._classify_standard)
+        results = {target: classify(zone, *a_results[target]) for target in targets}
+
+        if include_txt:
+            listed = [target for target, result in results.items() if result.status == "listed"]
+            if listed:
+                txt_results = await self._batch_query(
+                    zone, listed, RRTYPE_TXT, timeout_ms, semaphore, labels
+                )
+                for target in listed:
+                    results[target].txt_records = txt_results[target][1]
+
+        return results
+
+    def _add_result(self, aggregate: TargetResult, zone: str, result) -> None:
+        """Fold one zone's check result (or the exception that replaced it) into a target's aggregate."""
+        if isinstance(result, Exception):
+            aggregate.errors.append({
+                "zone": zone,
+                "error": str(result),
+            })
+            return
+
+        if result.status == "listed":
+            aggregate.listed.append({
+                "zone": zone,
+                "a": result.a_records,
+                "txt": result.txt_records,
+            })
+        elif result.status == "blocked":
+            aggregate.blocked.append({
+                "zone": zone,
+                "a": result.a_records,
+                "error": result.error_reason,
+            })
+        elif result.status == "error":
+            aggregate.errors.append({
+                "zone": zone,
+                "error": result.error_reason or "Unknown error",
+            })
+        elif result.status == "not_listed":
+            aggregate.not_listed_zones_count += 1
+
+    async def _check_targets(
+        self,
+        targets: List[str],
+        zones: List[str],
+        include_txt: bool,
+        concurrency: int,
+        timeout_ms: Optional[int],
+    ) -> List[TargetResult]:
+        """Check targets against zones, batching all targets per zone."""
+        # One semaphore caps queries in flight across every zone batch
+        semaphore = asyncio.Semaphore(concurrency)
+        unique_targets = list(dict.fromkeys(targets))
+        # Classify, reverse and encode each target once rather than once per zone
+        labels = {target: self._query_labels(target) for target in unique_targets}
+        aggregates = {
+            target: TargetResult(
+                target=target,
+                target_type="ip" if IPV4_RE.fullmatch(target) else "domain",
+                listed=[],
+                blocked=[],
+                errors=[],
+                not_listed_zones_count=0,
+            )
+            for target in unique_targets
+        }
+
+        async def check_zone_batch(zone: str):
+            try:
+                return zone, await self._check_zone_batch(
+                    unique_targets, zone, include_txt, timeout_ms, semaphore, labels
+                )
+            except Exception as e:
+                return zone, e
+
+        # Fold each zone in as soon as it finishes so finished batches can be freed
+        for next_batch in asyncio.as_completed([check_zone_batch(zone) for zone in zones]):
+            zone, batch = await next_batch
+            for target, aggregate in aggregates.items():
+                self._add_result(
+                    aggregate, zone, batch if isinstance(batch, Exception) else batch[target]
+                )
+
+        # Completion order is arbitrary; report zones in the order they were given
+        zone_order = {zone: i for i, zone in enumerate(zones)}
+        for aggregate in aggregates.values():
+            for items in (aggregate.listed, aggregate.blocked, aggregate.errors):
+                items.sort(key=lambda item: zone_order[item["zone"]])
+
+        return [aggregates[target] for target in targets]
+
     async def check_target(
         self,
         target: str,
         zones: List[str],
         include_txt: bool = False,
         concurrency: int = 50,
+        timeout_ms: Optional[int] = None,
     ) -> TargetResult:
         """Check a target against multiple zones concurrently."""
-        # Determine target type
-        try:
-            ipaddress.IPv4Address(target)
-            target_type = "ip"
-        except (ipaddress.AddressValueError, ValueError):
-            target_type = "domain"
-
-        # Create semaphore for concurrency control
-        semaphore = asyncio.Semaphore(concurrency)
-
-        async def check_single(zone: str) -> Tuple[str, CheckResult]:
-            async with semaphore:
-                result = await self.check_zone(target, zone, include_txt)
-                return zone, result
-
-        # Run all checks concurrently
-        tasks = [check_single(zone) for zone in zones]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Aggregate results
-        listed = []
-        blocked = []
-        errors = []
-        not_listed_count = 0
-
-        for zone, result in results:
-            if isinstance(result, Exception):
-                errors.append({
-                    "zone": zone,
-                    "error": str(result),
-                })
-                continue
-
-            if result.status == "listed":
-                listed.append({
-                    "zone": zone,
-                    "a": result.a_records,
-                    "txt": result.txt_records,
-                })
-            elif result.status == "blocked":
-                blocked.append({
-                    "zone": zone,
-                    "a": result.a_records,
-                    "error": result.error_reason,
-                })
-            elif result.status == "error":
-                errors.append({
-                    "zone": zone,
-                    "error": result.error_reason or "Unknown error",
-                })
-            elif result.status == "not_listed":
-                not_listed_count += 1
-
-        return TargetResult(
-            target=target,
-            target_type=target_type,
-            listed=listed,
-            blocked=blocked,
-            errors=errors,
-            not_listed_zones_count=not_listed_count,
-        )
+        results = await self._check_targets([target], zones, include_txt, concurrency, timeout_ms)
+        return results[0]
 
     async def check_multiple(
         self,
@@ -331,21 +763,13 @@ class DNSBLChecker:
         zones: List[str],
         include_txt: bool = False,
         concurrency: int = 50,
+        timeout_ms: Optional[int] = None,
     ) -> Tuple[Dict, List[Dict]]:
         """Check multiple targets against multiple zones."""
-        # Create semaphore for target-level concurrency
-        semaphore = asyncio.Semaphore(concurrency)
-
         results = []
 
-        async def check_single_target(target: str) -> TargetResult:
-            async with semaphore:
-                return await self.check_target(target, zones, include_txt, concurrency)
-
-        # Run all target checks concurrently
-        target_results = await asyncio.gather(
-            *[check_single_target(t) for t in targets],
-            return_exceptions=True,
+        target_results = await self._check_targets(
+            targets, zones, include_txt, concurrency, timeout_ms
         )
 
         # Process results and build summary
@@ -355,10 +779,6 @@ class DNSBLChecker:
         error_ips = 0
 
         for result in target_results:
-            if isinstance(result, Exception):
-                error_ips += 1
-                continue
-
             # Convert to dict format
             result_dict = {
                 "target": result.target,
@@ -389,6 +809,8 @@ class DNSBLChecker:
     def clear_cache(self) -> None:
         """Clear the cache."""
         self._cache.clear()
+        if self._negative is not None:
+            self._negative.clear()
 
     def get_cache_stats(self) -> Dict:
         """Get cache statistics."""
@@ -396,6 +818,10 @@ class DNSBLChecker:
             "size": len(self._cache),
             "max_size": self._cache.maxsize,
             "ttl_seconds": self._cache.ttl,
+            "hits": self._cache.hits,
+            "misses": self._cache.misses,
+            "negative_size": self._negative.size if self._negative else 0,
+            "negative_hits": self._negative.hits if self._negative else 0,
         }
 
 
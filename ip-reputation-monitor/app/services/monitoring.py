@@ -1,23 +1,57 @@
 """Monitoring service for scheduled checks and alerts."""
 
 import asyncio
-import json
+import logging
+import random
+import threading
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 import httpx
+import orjson
+from cachetools import TTLCache
+from sqlalchemy import case, func, insert, select, update
 
-from app.core.database import get_db_context
+from app.core.database import get_db_context, upsert
 from app.models.database import (
     Alert,
     CheckResult,
     MonitorRun,
     Target,
+    TargetLatestStatus,
     Zone,
 )
 from app.services.dnsbl_checker import CheckResult as DNSBLCheckResult, get_checker
 from app.core.config import settings
 
+# Built once so each run only adds its optional id filters
+ENABLED_TARGETS = select(Target).where(Target.enabled == True)
+ENABLED_ZONES = select(Zone).where(Zone.enabled == True)
+# Last stored status of every (enabled target, enabled zone) pair
+PREVIOUS_STATUSES = (
+    select(CheckResult.target_id, CheckResult.zone_id, CheckResult.status)
+    .join(Target, CheckResult.target_id == Target.id)
+    .join(Zone, CheckResult.zone_id == Zone.id)
+    .where(Target.enabled == True, Zone.enabled == True)
+)
+
+# Rows per executemany call when upserting a run's check results
+CHECK_RESULT_UPSERT_CHUNK = 10_000
+
+# Webhook delivery attempts; the delay doubles per retry up to the cap, with jitter
+WEBHOOK_ATTEMPTS = 3
+WEBHOOK_BACKOFF_SEC = 0.5
+WEBHOOK_BACKOFF_MAX_SEC = 8.0
+# Webhook deliveries allowed in flight at once
+WEBHOOK_CONCURRENCY = 4
+
+# How long a get_latest_status result is served to repeat callers; cleared
+# whenever a run commits
+STATUS_CACHE_TTL_SEC = 10.0
+
+logger = logging.getLogger(__name__)
+
 
 class MonitoringService:
     """Service for running scheduled monitoring checks."""
@@ -25,41 +59,68 @@ class MonitoringService:
     def __init__(self):
         self.checker = get_checker()
         self._is_running = False
+        self._http: Optional[httpx.AsyncClient] = None
+        self._webhook_tasks: Set[asyncio.Task] = set()
+        self._webhook_semaphore = asyncio.Semaphore(WEBHOOK_CONCURRENCY)
+        self._status_cache: TTLCache = TTLCache(maxsize=64, ttl=STATUS_CACHE_TTL_SEC)
+        self._status_lock = threading.Lock()
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the shared webhook client, keeping its connections alive across runs."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(timeout=settings.ALERT_WEBHOOK_TIMEOUT_SEC)
+        return self._http
+
+    async def aclose(self) -> None:
+        """Wait for pending webhook deliveries, then close the shared webhook client."""
+        if self._webhook_tasks:
+            await asyncio.gather(*self._webhook_tasks, return_exceptions=True)
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def run_monitoring(
         self,
         triggered_by: str = "scheduler",
         target_ids: Optional[List[int]] = None,
         zone_ids: Optional[List[int]] = None,
+        run_id: Optional[int] = None,
     ) -> MonitorRun:
-        """Run a full monitoring check."""
+        """
+        Run a full monitoring check.
+
+        When run_id is given, that already inserted run record is used instead
+        of creating a new one.
+        """
         if self._is_running:
             raise RuntimeError("Monitoring is already running")
 
         self._is_running = True
 
         with get_db_context() as db:
-            # Create monitor run record
-            run = MonitorRun(
-                triggered_by=triggered_by,
-                status="running",
-                started_at=datetime.utcnow(),
-            )
-            db.add(run)
-            db.flush()
+            run = db.get(MonitorRun, run_id) if run_id is not None else None
+            if run is None:
+                # Create monitor run record; the flush INSERT returns its id
+                run = MonitorRun(
+                    triggered_by=triggered_by,
+                    status="running",
+                    started_at=datetime.utcnow(),
+                )
+                db.add(run)
+                db.flush()
 
             try:
                 # Get targets to check
-                query = db.query(Target).filter(Target.enabled == True)
+                stmt = ENABLED_TARGETS
                 if target_ids:
-                    query = query.filter(Target.id.in_(target_ids))
-                targets = query.all()
+                    stmt = stmt.where(Target.id.in_(target_ids))
+                targets = db.scalars(stmt).all()
 
                 # Get zones to check
-                query = db.query(Zone).filter(Zone.enabled == True)
+                stmt = ENABLED_ZONES
                 if zone_ids:
-                    query = query.filter(Zone.id.in_(zone_ids))
-                zones = query.all()
+                    stmt = stmt.where(Zone.id.in_(zone_ids))
+                zones = db.scalars(stmt).all()
 
                 run.total_targets = len(targets)
                 run.total_zones = len(zones)
@@ -76,25 +137,19 @@ class MonitoringService:
                 # Prepare zone list
                 zone_list = [z.zone for z in zones]
 
-                # Track previous statuses for alerting
-                previous_statuses = {}
-                for target in targets:
-                    previous_results = (
-                        db.query(CheckResult)
-                        .filter(CheckResult.target_id == target.id)
-                        .filter(CheckResult.zone_id.in_([z.id for z in zones]))
-                        .all()
-                    )
-                    for pr in previous_results:
-                        key = (target.id, pr.zone_id)
-                        previous_statuses[key] = pr.status
+                # Track previous statuses for alerting, using the same filters
+                # as the target and zone selection
+                stmt = PREVIOUS_STATUSES
+                if target_ids:
+                    stmt = stmt.where(Target.id.in_(target_ids))
+                if zone_ids:
+                    stmt = stmt.where(Zone.id.in_(zone_ids))
+                previous_statuses = {
+                    (target_id, zone_id): prev_status
+                    for target_id, zone_id, prev_status in db.execute(stmt)
+                }
 
                 # Run checks
-                total_checks = 0
-                listed_count = 0
-                blocked_count = 0
-                error_count = 0
-
                 target_list = [t.target for t in targets]
                 summary, target_results = await self.checker.check_multiple(
                     targets=target_list,
@@ -103,82 +158,24 @@ class MonitoringService:
                     concurrency=settings.DNS_CONCURRENCY,
                 )
 
-                # Process results and save to database
-                zone_map = {z.zone: z for z in zones}
-                target_map = {t.target: t for t in targets}
-
-                for result in target_results:
-                    target = target_map.get(result["target"])
-                    if not target:
-                        continue
-
-                    for listed in result["listed"]:
-                        zone = zone_map.get(listed["zone"])
-                        if zone:
-                            self._save_check_result(
-                                db, target, zone, "listed", listed["a"], run.id
-                            )
-                            listed_count += 1
-                            total_checks += 1
-
-                            # Check for alert
-                            prev_status = previous_statuses.get((target.id, zone.id))
-                            if prev_status != "listed":
-                                self._create_alert(
-                                    db,
-                                    target,
-                                    "newly_listed",
-                                    zone.zone,
-                                    prev_status,
-                                    "listed",
-                                    f"Target {target.target} is now listed on {zone.zone}",
-                                )
-
-                    for blocked in result["blocked"]:
-                        zone = zone_map.get(blocked["zone"])
-                        if zone:
-                            self._save_check_result(
-                                db, target, zone, "blocked", blocked["a"], run.id
-                            )
-                            blocked_count += 1
-                            total_checks += 1
-
-                            prev_status = previous_statuses.get((target.id, zone.id))
-                            if prev_status != "blocked":
-                                self._create_alert(
-                                    db,
-                                    target,
-                                    "blocked",
-                                    zone.zone,
-                                    prev_status,
-                                    "blocked",
-                                    f"Target {target.target} is blocked on {zone.zone} (limits reached)",
-                                )
-
-                    for error in result["errors"]:
-                        zone = zone_map.get(error["zone"])
-                        if zone:
-                            self._save_check_result(
-                                db, target, zone, "error", [], run.id, error["error"]
-                            )
-                            error_count += 1
-                            total_checks += 1
-
-                    # Note: not_listed zones are not saved individually for performance
-
-                # Update run with final stats
-                run.total_checks = total_checks
-                run.listed_count = listed_count
-                run.blocked_count = blocked_count
-                run.error_count = error_count
-                run.status = "completed"
-                run.finished_at = datetime.utcnow()
-                run.duration_seconds = int((run.finished_at - run.started_at).total_seconds())
+                # Result processing and writes are synchronous, so keep them
+                # off the event loop
+                alert_ids, alert_payloads = await asyncio.to_thread(
+                    self._persist_results, db, run, targets, zones, target_results, previous_statuses
+                )
 
-                db.commit()
+                # Reload the committed run and detach it so callers can read it
+                # after the session closes
+                db.refresh(run)
+                db.expunge(run)
 
-                # Send webhooks for alerts
-                await self._send_webhooks(db, run)
+                # Deliver webhooks in the background; the run is complete once
+                # its results are committed
+                if alert_ids and settings.ALERT_WEBHOOK_URL:
+                    payload = self._webhook_payload(run, alert_payloads)
+                    task = asyncio.create_task(self._send_webhooks_detached(payload, alert_ids))
+                    self._webhook_tasks.add(task)
+                    task.add_done_callback(self._webhook_tasks.discard)
 
                 return run
 
@@ -192,167 +189,440 @@ class MonitoringService:
             finally:
                 self._is_running = False
 
-    def _save_check_result(
+    def _persist_results(
         self,
         db,
-        target: Target,
-        zone: Zone,
-        status: str,
-        a_records: List[str],
-        run_id: int,
-        error_reason: Optional[str] = None,
+        run: MonitorRun,
+        targets: List[Target],
+        zones: List[Zone],
+        target_results: List[Dict],
+        previous_statuses: Dict,
+    ) -> Tuple[List[int], List[Dict]]:
+        """
+        Save a run's check results and alerts and commit.
+
+        Returns the new alert ids and the alerts' webhook payload entries.
+        """
+        listed_count = 0
+        blocked_count = 0
+        error_count = 0
+
+        zone_ids = {z.zone: z.id for z in zones}
+        target_map = {t.target: t for t in targets}
+        run_id = run.id
+        # Plain dicts feed the Core upsert directly; no ORM objects per result
+        check_rows: List[Dict] = []
+        add_row = check_rows.append
+        alert_rows: List[Dict] = []
+        alert_payloads: List[Dict] = []
+        # One timestamp for every row this run writes
+        now = datetime.utcnow()
+
+        for result in target_results:
+            target = target_map.get(result["target"])
+            if not target:
+                continue
+            target_id = target.id
+
+            for listed in result["listed"]:
+                zone_id = zone_ids.get(listed["zone"])
+                if zone_id is None:
+                    continue
+                add_row({
+                    "target_id": target_id,
+                    "zone_id": zone_id,
+                    "status": "listed",
+                    "a_records": listed["a"] or None,
+                    "error_reason": None,
+                    "last_seen": now,
+                    "last_checked": now,
+                    "run_id": run_id,
+                })
+                listed_count += 1
+
+                # Check for alert
+                prev_status = previous_statuses.get((target_id, zone_id))
+                if prev_status != "listed":
+                    self._create_alert(
+                        target,
+                        "newly_listed",
+                        listed["zone"],
+                        prev_status,
+                        "listed",
+                        f"Target {target.target} is now listed on {listed['zone']}",
+                        alert_rows,
+                        alert_payloads,
+                        now,
+                    )
+
+            for blocked in result["blocked"]:
+                zone_id = zone_ids.get(blocked["zone"])
+                if zone_id is None:
+                    continue
+                add_row({
+                    "target_id": target_id,
+                    "zone_id": zone_id,
+                    "status": "blocked",
+                    "a_records": blocked["a"] or None,
+                    "error_reason": None,
+                    "last_seen": now,
+                    "last_checked": now,
+                    "run_id": run_id,
+                })
+                blocked_count += 1
+
+                prev_status = previous_statuses.get((target_id, zone_id))
+                if prev_status != "blocked":
+                    self._create_alert(
+                        target,
+                        "blocked",
+                        blocked["zone"],
+                        prev_status,
+                        "blocked",
+                        f"Target {target.target} is blocked on {blocked['zone']} (limits reached)",
+                        alert_rows,
+                        alert_payloads,
+                        now,
+                    )
+
+            for error in result["errors"]:
+                zone_id = zone_ids.get(error["zone"])
+                if zone_id is None:
+                    continue
+                add_row({
+                    "target_id": target_id,
+                    "zone_id": zone_id,
+                    "status": "error",
+                    "a_records": None,
+                    "error_reason": error["error"],
+                    "last_seen": now,
+                    "last_checked": now,
+                    "run_id": run_id,
+                })
+                error_count += 1
+
+            # Note: not_listed zones are not saved individually for performance
+
+        self._upsert_check_results(db, check_rows)
+        alert_ids = self._insert_alerts(db, alert_rows)
+
+        # Refresh pre-aggregated status in the same transaction
+        db.flush()
+        self.refresh_latest_status(db, [t.id for t in targets])
+
+        # Update run with final stats
+        run.total_checks = len(check_rows)
+        run.listed_count = listed_count
+        run.blocked_count = blocked_count
+        run.error_count = error_count
+        run.status = "completed"
+        run.finished_at = datetime.utcnow()
+        run.duration_seconds = int((run.finished_at - run.started_at).total_seconds())
+
+        db.commit()
+        self.clear_status_cache()
+
+        return alert_ids, alert_payloads
+
+    def _upsert_check_results(self, db, rows: List[Dict]) -> None:
+        """
+        Write check results, one row per (target, zone) pair.
+
+        New pairs are inserted and existing ones updated in the same Core
+        executemany, bypassing the unit of work. txt_records is not part of
+        the rows, so updates leave it as it was.
+        """
+        for start in range(0, len(rows), CHECK_RESULT_UPSERT_CHUNK):
+            upsert(
+                db,
+                CheckResult,
+                rows[start:start + CHECK_RESULT_UPSERT_CHUNK],
+                ["target_id", "zone_id"],
+            )
+
+    def clear_status_cache(self) -> None:
+        """Drop cached status views after check results change."""
+        with self._status_lock:
+            self._status_cache.clear()
+
+    def refresh_latest_status(
+        self, db, target_ids: Optional[List[int]] = None
     ) -> None:
-        """Save a check result to the database."""
-        # Check if there's already a recent result for this target/zone
-        existing = (
-            db.query(CheckResult)
-            .filter(CheckResult.target_id == target.id)
-            .filter(CheckResult.zone_id == zone.id)
-            .first()
+        """
+        Recompute TargetLatestStatus rows from check results.
+
+        Targets in target_ids without any issue rows are reset to zero. When
+        target_ids is None, every target with an issue row is refreshed.
+        """
+        query = (
+            db.query(
+                CheckResult.target_id,
+                func.sum(case((CheckResult.status == "listed", 1), else_=0)),
+                func.sum(case((CheckResult.status == "blocked", 1), else_=0)),
+                func.sum(case((CheckResult.status == "error", 1), else_=0)),
+                func.max(CheckResult.last_checked),
+            )
+            .filter(CheckResult.status.in_(["listed", "blocked", "error"]))
+            .group_by(CheckResult.target_id)
         )
+        if target_ids is not None:
+            query = query.filter(CheckResult.target_id.in_(target_ids))
+
+        rows = {
+            target_id: {
+                "target_id": target_id,
+                "listed_count": 0,
+                "blocked_count": 0,
+                "error_count": 0,
+                "last_checked": None,
+            }
+            for target_id in target_ids or []
+        }
+        for target_id, listed, blocked, errors, last_checked in query.all():
+            rows[target_id] = {
+                "target_id": target_id,
+                "listed_count": listed,
+                "blocked_count": blocked,
+                "error_count": errors,
+                "last_checked": last_checked,
+            }
 
-        if existing:
-            # Update existing
-            existing.status = status
-            existing.a_records = json.dumps(a_records) if a_records else None
-            existing.last_checked = datetime.utcnow()
-            if status != "not_listed":
-                existing.last_seen = datetime.utcnow()
-            existing.error_reason = error_reason
-            existing.run_id = run_id
-        else:
-            # Create new
-            result = CheckResult(
-                target_id=target.id,
-                zone_id=zone.id,
-                status=status,
-                a_records=json.dumps(a_records) if a_records else None,
-                error_reason=error_reason,
-                last_seen=datetime.utcnow() if status != "not_listed" else datetime.utcnow(),
-                last_checked=datetime.utcnow(),
-                run_id=run_id,
-            )
-            db.add(result)
+        upsert(db, TargetLatestStatus, list(rows.values()), ["target_id"])
 
     def _create_alert(
         self,
-        db,
         target: Optional[Target],
         alert_type: str,
         zone: str,
         old_status: Optional[str],
         new_status: str,
         message: str,
-    ) -> Alert:
-        """Create an alert."""
-        alert = Alert(
-            alert_type=alert_type,
-            target_id=target.id if target else None,
-            zone=zone,
-            old_status=old_status,
-            new_status=new_status,
-            message=message,
-            webhook_sent=False,
-        )
-        db.add(alert)
-        return alert
-
-    async def _send_webhooks(self, db, run: MonitorRun) -> None:
-        """Send webhooks for unsent alerts."""
-        if not settings.ALERT_WEBHOOK_URL:
-            return
-
-        # Get unsent alerts from this run
-        alerts = (
-            db.query(Alert)
-            .filter(Alert.webhook_sent == False)
-            .filter(Alert.created_at >= run.started_at)
-            .all()
-        )
-
-        if not alerts:
-            return
-
-        # Prepare webhook payload
-        payload = {
+        rows: List[Dict],
+        payloads: List[Dict],
+        now: Optional[datetime] = None,
+    ) -> None:
+        """Queue an alert for the run's bulk insert and its webhook payload entry."""
+        if now is None:
+            now = datetime.utcnow()
+        rows.append({
+            "alert_type": alert_type,
+            "target_id": target.id if target else None,
+            "zone": zone,
+            "old_status": old_status,
+            "new_status": new_status,
+            "message": message,
+            "webhook_sent": False,
+            "created_at": now,
+        })
+        payloads.append({
+            "type": alert_type,
+            "target": target.target if target else None,
+            "zone": zone,
+            "old_status": old_status,
+            "new_status": new_status,
+            "message": message,
+            "created_at": now,
+        })
+
+    def _insert_alerts(self, db, rows: List[Dict]) -> List[int]:
+        """Insert queued alerts in one Core executemany and return their ids."""
+        if not rows:
+            return []
+        return db.scalars(insert(Alert).returning(Alert.id), rows).all()
+
+    def _webhook_payload(self, run: MonitorRun, alert_payloads: List[Dict]) -> Dict:
+        """Build the webhook body for a finished run."""
+        return {
             "run_id": run.id,
             "triggered_by": run.triggered_by,
-            "started_at": run.started_at.isoformat(),
+            "started_at": run.started_at,
             "summary": {
                 "listed_count": run.listed_count,
                 "blocked_count": run.blocked_count,
                 "error_count": run.error_count,
             },
-            "alerts": [
-                {
-                    "type": a.alert_type,
-                    "target": db.query(Target).filter(Target.id == a.target_id).first().target if a.target_id else None,
-                    "zone": a.zone,
-                    "old_status": a.old_status,
-                    "new_status": a.new_status,
-                    "message": a.message,
-                    "created_at": a.created_at.isoformat(),
-                }
-                for a in alerts
-            ],
+            "alerts": alert_payloads,
         }
 
+    async def _send_webhooks_detached(self, payload: Dict, alert_ids: List[int]) -> None:
+        """Send a run's webhook and record delivery with a session of its own."""
+        async with self._webhook_semaphore:
+            try:
+                with get_db_context() as db:
+                    await self._send_webhooks(db, payload, alert_ids)
+            except Exception:
+                logger.exception("Webhook delivery for run %s failed", payload["run_id"])
+
+    async def _send_webhooks(self, db, payload: Dict, alert_ids: List[int]) -> None:
+        """Send a webhook for the given alerts and record the delivery state."""
+        if not settings.ALERT_WEBHOOK_URL or not alert_ids:
+            return
+
+        # Delivery state is written with one UPDATE for the whole batch
+        mark_alerts = (
+            update(Alert)
+            .where(Alert.id.in_(alert_ids))
+            .execution_options(synchronize_session=False)
+        )
+
         # Send webhook
         try:
-            async with httpx.AsyncClient(timeout=settings.ALERT_WEBHOOK_TIMEOUT_SEC) as client:
-                response = await client.post(settings.ALERT_WEBHOOK_URL, json=payload)
-                response.raise_for_status()
+            await self._post_webhook(payload)
 
-                # Mark alerts as sent
-                for alert in alerts:
-                    alert.webhook_sent = True
-                    alert.webhook_status = "sent"
-                db.commit()
+            # Mark alerts as sent
+            db.execute(mark_alerts.values(webhook_sent=True, webhook_status="sent"))
+            db.commit()
 
         except Exception as e:
             # Mark alerts as failed
-            for alert in alerts:
-                alert.webhook_sent = False
-                alert.webhook_status = "failed"
-                alert.webhook_error = str(e)
+            db.execute(
+                mark_alerts.values(webhook_sent=False, webhook_status="failed", webhook_error=str(e))
+            )
             db.commit()
 
-    def get_latest_status(self, db, limit: int = 100) -> List[Dict]:
-        """Get latest status for all targets."""
-        # Get all enabled targets with their latest results
-        targets = db.query(Target).filter(Target.enabled == True).all()
+    async def _post_webhook(self, payload: Dict) -> None:
+        """POST a payload, retrying transport errors, 429 and 5xx responses."""
+        client = self._get_http_client()
+        # Serialized once for all attempts; orjson writes datetimes as ISO 8601
+        body = orjson.dumps(payload)
+        for attempt in range(WEBHOOK_ATTEMPTS):
+            try:
+                response = await client.post(
+                    settings.ALERT_WEBHOOK_URL,
+                    content=body,
+                    headers={"Content-Type": "application/json"},
+                )
+                response.raise_for_status()
+                return
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if attempt + 1 >= WEBHOOK_ATTEMPTS or (status != 429 and status < 500):
+                    raise
+            except httpx.TransportError:
+                if attempt + 1 >= WEBHOOK_ATTEMPTS:
+                    raise
+            delay = min(WEBHOOK_BACKOFF_SEC * (2 ** attempt), WEBHOOK_BACKOFF_MAX_SEC)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    def get_latest_status(
+        self,
+        db,
+        limit: Optional[int] = 100,
+        type_filter: Optional[str] = None,
+        has_issues_only: bool = False,
+    ) -> List[Dict]:
+        """
+        Get latest status for enabled targets, filtered and limited in SQL.
+
+        Results are cached per filter combination for STATUS_CACHE_TTL_SEC.
+        The lock is held across the query, so concurrent misses wait and then
+        share one result instead of each querying.
+        """
+        key = (limit, type_filter, has_issues_only)
+        with self._status_lock:
+            results = self._status_cache.get(key)
+            if results is None:
+                results = self._query_latest_status(db, limit, type_filter, has_issues_only)
+                self._status_cache[key] = results
+        return results
 
-        results = []
-        for target in targets:
-            # Get latest results for this target
-            latest_results = (
-                db.query(CheckResult, Zone)
+    def _query_latest_status(
+        self,
+        db,
+        limit: Optional[int],
+        type_filter: Optional[str],
+        has_issues_only: bool,
+    ) -> List[Dict]:
+        """Build the get_latest_status result from the database."""
+        query = (
+            db.query(
+                Target.id,
+                Target.target,
+                Target.type,
+                Target.label,
+                Target.tags,
+                TargetLatestStatus.listed_count,
+                TargetLatestStatus.blocked_count,
+                TargetLatestStatus.error_count,
+                TargetLatestStatus.last_checked,
+            )
+            .outerjoin(TargetLatestStatus, TargetLatestStatus.target_id == Target.id)
+            .filter(Target.enabled == True)
+        )
+        if type_filter:
+            query = query.filter(Target.type == type_filter)
+        if has_issues_only:
+            query = query.filter(
+                TargetLatestStatus.listed_count
+                + TargetLatestStatus.blocked_count
+                + TargetLatestStatus.error_count
+                > 0
+            )
+        # Stable target order, so a limited result is the same page every time
+        query = query.order_by(Target.id)
+        if limit:
+            query = query.limit(limit)
+
+        rows = query.all()
+
+        # Top 10 issues for every returned target in one query; counts come
+        # from TargetLatestStatus, so only the rows shown are loaded
+        issues_by_target = defaultdict(list)
+        if rows:
+            ranked = (
+                select(
+                    CheckResult.target_id,
+                    Zone.zone,
+                    CheckResult.status,
+                    CheckResult.a_records,
+                    CheckResult.last_seen,
+                    func.row_number()
+                    .over(
+                        partition_by=CheckResult.target_id,
+                        order_by=CheckResult.last_seen.desc(),
+                    )
+                    .label("rank"),
+                )
                 .join(Zone, CheckResult.zone_id == Zone.id)
-                .filter(CheckResult.target_id == target.id)
-                .filter(CheckResult.status.in_(["listed", "blocked", "error"]))
-                .order_by(CheckResult.last_seen.desc())
-                .all()
+                .where(CheckResult.target_id.in_([row[0] for row in rows]))
+                .where(CheckResult.status.in_(["listed", "blocked", "error"]))
+                .subquery()
             )
+            issue_rows = db.execute(
+                select(
+                    ranked.c.target_id,
+                    ranked.c.zone,
+                    ranked.c.status,
+                    ranked.c.a_records,
+                    ranked.c.last_seen,
+                )
+                .where(ranked.c.rank <= 10)
+                .order_by(ranked.c.target_id, ranked.c.rank)
+            )
+            for target_id, zone, status, a_records, last_seen in issue_rows:
+                issues_by_target[target_id].append({
+                    "zone": zone,
+                    "status": status,
+                    "a_records": a_records or [],
+                    "last_seen": last_seen.isoformat(),
+                })
 
+        results = []
+        for (
+            target_id, target, target_type, label, tags,
+            listed_count, blocked_count, error_count, last_checked,
+        ) in rows:
             results.append({
-                "id": target.id,
-                "target": target.target,
-                "type": target.type,
-                "label": target.label,
-                "tags": json.loads(target.tags) if target.tags else [],
-                "listed_count": sum(1 for r, z in latest_results if r.status == "listed"),
-                "blocked_count": sum(1 for r, z in latest_results if r.status == "blocked"),
-                "error_count": sum(1 for r, z in latest_results if r.status == "error"),
-                "last_checked": max([r.last_checked for r, z in latest_results]) if latest_results else None,
-                "issues": [
-                    {
-                        "zone": z.zone,
-                        "status": r.status,
-                        "a_records": json.loads(r.a_records) if r.a_records else [],
-                        "last_seen": r.last_seen.isoformat(),
-                    }
-                    for r, z in latest_results[:10]  # Top 10 issues
-                ],
+                "id": target_id,
+                "target": target,
+                "type": target_type,
+                "label": label,
+                "tags": tags or [],
+                "listed_count": listed_count or 0,
+                "blocked_count": blocked_count or 0,
+                "error_count": error_count or 0,
+                "last_checked": last_checked,
+                "issues": issues_by_target.get(target_id, []),
             })
 
         return results
@@ -362,7 +632,14 @@ class MonitoringService:
     ) -> List[Dict]:
         """Get history for a specific target."""
         results = (
-            db.query(CheckResult, Zone)
+            db.query(
+                Zone.zone,
+                CheckResult.status,
+                CheckResult.a_records,
+                CheckResult.error_reason,
+                CheckResult.last_checked,
+                CheckResult.last_seen,
+            )
             .join(Zone, CheckResult.zone_id == Zone.id)
             .filter(CheckResult.target_id == target_id)
             .order_by(CheckResult.last_checked.desc())
@@ -372,14 +649,14 @@ class MonitoringService:
 
         return [
             {
-                "zone": z.zone,
-                "status": r.status,
-                "a_records": json.loads(r.a_records) if r.a_records else [],
-                "error_reason": r.error_reason,
-                "last_checked": r.last_checked.isoformat(),
-                "last_seen": r.last_seen.isoformat(),
+                "zone": zone,
+                "status": status,
+                "a_records": a_records or [],
+                "error_reason": error_reason,
+                "last_checked": last_checked.isoformat(),
+                "last_seen": last_seen.isoformat(),
             }
-            for r, z in results
+            for zone, status, a_records, error_reason, last_checked, last_seen in results
         ]
 
 
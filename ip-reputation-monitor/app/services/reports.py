@@ -1,23 +1,113 @@
 """Report generation service (CSV, XLSX, PDF)."""
 
 import csv
+import gzip
+import hashlib
 import io
-import json
 import os
+import secrets
+import tempfile
+import threading
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from cachetools import LRUCache
+from sqlalchemy import Text, case, cast, func, select
 
 from app.core.config import settings
 from app.core.database import get_db_context
 from app.models.database import CheckResult, MonitorRun, Target, Zone
 
+# Columns of a detailed report row, read as plain tuples; a_records is read
+# as its stored JSON text, which every writer emits verbatim
+DETAIL_COLUMNS = (
+    Target.target,
+    Target.type,
+    Zone.zone,
+    CheckResult.status,
+    cast(CheckResult.a_records, Text),
+    CheckResult.error_reason,
+    CheckResult.last_checked,
+    CheckResult.last_seen,
+)
+
+# Listed, blocked and error counts for a grouped check result query
+STATUS_COUNTS = (
+    func.sum(case((CheckResult.status == "listed", 1), else_=0)),
+    func.sum(case((CheckResult.status == "blocked", 1), else_=0)),
+    func.sum(case((CheckResult.status == "error", 1), else_=0)),
+)
+
+# Gathered report datasets kept in memory for reuse across formats
+REPORT_DATA_CACHE_SIZE = 4
+
+# Write buffer for CSV reports, so large reports reach the file in few writes
+CSV_BUFFER_BYTES = 1 << 20
+
+# Compression level for gzipped CSV reports; level 1 keeps most of the ratio
+# on repetitive target/zone text at a fraction of the default level's CPU
+CSV_GZIP_LEVEL = 1
+
+# PDF layout, in points
+PDF_MARGIN = 50
+PDF_ROW_HEIGHT = 12
+PDF_DETAIL_FONT_SIZE = 8
+PDF_DETAIL_COLUMNS = (
+    ("Target", 125),
+    ("Zone", 140),
+    ("Status", 45),
+    ("A Records", 100),
+    ("Last Checked", 85),
+)
+# Table style commands; colours by name so reportlab is only imported for PDFs
+PDF_ZONE_TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), 'grey'),
+    ('TEXTCOLOR', (0, 0), (-1, 0), 'whitesmoke'),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), 'beige'),
+    ('GRID', (0, 0), (-1, -1), 1, 'black'),
+]
+
+# Fixed XLSX column widths; write-only sheets cannot be measured after writing
+XLSX_SUMMARY_WIDTHS = {"A": 22, "B": 50}
+XLSX_TARGET_WIDTHS = {"A": 40, "B": 8, "C": 30, "D": 9, "E": 9, "F": 9}
+XLSX_ZONE_WIDTHS = {"A": 35, "B": 9, "C": 9, "D": 9}
+XLSX_DETAIL_WIDTHS = {
+    "A": 40, "B": 8, "C": 35, "D": 11, "E": 30, "F": 40, "G": 28, "H": 28,
+}
+
+
+@lru_cache(maxsize=None)
+def _xlsx_styles():
+    """Title font, header font and header fill, shared by every styled cell."""
+    from openpyxl.styles import Font, PatternFill
+
+    return (
+        Font(bold=True, size=14),
+        Font(bold=True),
+        PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid"),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _pdf_clip(text: str, width: float) -> str:
+    """Shorten text to fit a detail column; zones and statuses repeat, so results are cached."""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    text_width = stringWidth(text, "Helvetica", PDF_DETAIL_FONT_SIZE)
+    if text_width <= width:
+        return text
+    # Start from a proportional cut and trim the last few characters
+    keep = int(len(text) * width / text_width)
+    while keep and stringWidth(text[:keep] + "...", "Helvetica", PDF_DETAIL_FONT_SIZE) > width:
+        keep -= 1
+    return text[:keep] + "..."
+
 
 class ReportService:
     """Service for generating reports."""
@@ -25,6 +115,10 @@ class ReportService:
     def __init__(self):
         self.reports_dir = settings.REPORTS_DIR
         os.makedirs(self.reports_dir, exist_ok=True)
+        # Gathered data by filter and run, so other formats of the same
+        # report skip the database
+        self._data_cache: LRUCache = LRUCache(maxsize=REPORT_DATA_CACHE_SIZE)
+        self._data_cache_lock = threading.Lock()
 
     def generate_report(
         self,
@@ -34,28 +128,131 @@ class ReportService:
         target_ids: Optional[List[int]] = None,
         zone_ids: Optional[List[int]] = None,
         status_filter: Optional[str] = None,
+        compress: bool = False,
     ) -> tuple[str, int]:
         """
         Generate a report and return file path and size.
 
+        With compress, CSV reports are written gzipped as .csv.gz; other
+        formats are already compressed and ignore it.
+
+        Output is cached per report type, filters and latest monitor run: a
+        repeat request hard-links the earlier file under a new name instead of
+        regenerating it, so deleting one report never removes another's file.
+        Writers only ever fill a fresh temporary file, which is then linked
+        into place, so a path that may share its inode with other reports is
+        never opened for writing.
+
         Returns:
             Tuple of (file_path, file_size_bytes)
         """
-        # Gather data
-        data = self._gather_report_data(date_from, date_to, target_ids, zone_ids, status_filter)
-
-        # Generate based on type
-        if report_type == "csv":
-            return self._generate_csv(data)
-        elif report_type == "xlsx":
-            return self._generate_xlsx(data)
-        elif report_type == "pdf":
-            return self._generate_pdf(data)
-        else:
+        if report_type not in ("csv", "xlsx", "pdf"):
             raise ValueError(f"Unsupported report type: {report_type}")
+        compress = compress and report_type == "csv"
+        extension = "csv.gz" if compress else report_type
+
+        with get_db_context() as db:
+            latest_run = self._latest_run(db)
+
+        data_key = self._cache_key(
+            date_from,
+            date_to,
+            tuple(target_ids or ()),
+            tuple(zone_ids or ()),
+            status_filter,
+            tuple(latest_run) if latest_run else None,
+        )
+        cached_path = os.path.join(
+            self.reports_dir, f"report_{self._cache_key(report_type, data_key)}.{extension}"
+        )
+
+        # Named once here; the random suffix keeps reports started in the
+        # same second from sharing a name
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        filepath = os.path.join(
+            self.reports_dir, f"report_{timestamp}_{secrets.token_hex(4)}.{extension}"
+        )
+        try:
+            # Links share the inode's mtime; touch it first so cleanup ages
+            # the new report from now rather than from the cached original
+            os.utime(cached_path)
+            os.link(cached_path, filepath)
+            return filepath, os.path.getsize(filepath)
+        except OSError:
+            pass
+
+        # Gather data
+        with self._data_cache_lock:
+            data = self._data_cache.get(data_key)
+        if data is None:
+            data = self._gather_report_data(
+                latest_run, date_from, date_to, target_ids, zone_ids, status_filter
+            )
+            with self._data_cache_lock:
+                self._data_cache[data_key] = data
+
+        # Generate based on type, into a file no other report can reference
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=".report_", suffix=f".{extension}", dir=self.reports_dir
+        )
+        os.close(fd)
+        try:
+            # mkstemp creates 0600; downloads may be served by nginx directly
+            os.chmod(tmp_path, 0o644)
+            if report_type == "csv":
+                file_size = self._generate_csv(data, tmp_path, compress)
+            elif report_type == "xlsx":
+                file_size = self._generate_xlsx(data, tmp_path)
+            else:
+                file_size = self._generate_pdf(data, tmp_path)
+
+            try:
+                os.link(tmp_path, filepath)
+            except OSError:
+                # No hard links on this filesystem, so no output cache either
+                os.replace(tmp_path, filepath)
+            else:
+                # Swaps in a new inode, leaving files linked to any older copy intact
+                os.replace(tmp_path, cached_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return filepath, file_size
+
+    @staticmethod
+    def _cache_key(*parts) -> str:
+        """Hash report parameters into a short file-name-safe key."""
+        return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _latest_run(db):
+        """Get (id, started_at, finished_at) of the run reports cover, or None."""
+        # Report scope: always use latest monitor run results.
+        stmt = (
+            select(MonitorRun.id, MonitorRun.started_at, MonitorRun.finished_at)
+            .order_by(MonitorRun.started_at.desc())
+            .limit(1)
+        )
+        latest_run = db.execute(stmt.where(MonitorRun.status == "completed")).first()
+        if not latest_run:
+            latest_run = db.execute(stmt).first()
+        return latest_run
+
+    @staticmethod
+    def _blocked_ip_query(db, filters) -> List[str]:
+        """Get the sorted, distinct IP targets with a blocked result under the report filters."""
+        return list(db.scalars(
+            select(Target.target)
+            .distinct()
+            .join(CheckResult, CheckResult.target_id == Target.id)
+            .where(*filters, CheckResult.status == "blocked", Target.type == "ip")
+            .order_by(Target.target)
+        ))
 
     def _gather_report_data(
         self,
+        latest_run,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         target_ids: Optional[List[int]] = None,
@@ -64,130 +261,110 @@ class ReportService:
     ) -> dict:
         """Gather data for the report."""
         with get_db_context() as db:
-            # Report scope: always use latest monitor run results.
-            latest_run = (
-                db.query(MonitorRun)
-                .filter(MonitorRun.status == "completed")
-                .order_by(MonitorRun.started_at.desc())
-                .first()
-            )
-
-            if not latest_run:
-                latest_run = db.query(MonitorRun).order_by(MonitorRun.started_at.desc()).first()
-
-            # Build query
-            query = db.query(CheckResult, Target, Zone).join(Target, CheckResult.target_id == Target.id).join(Zone, CheckResult.zone_id == Zone.id)
-
-            if latest_run:
-                query = query.filter(CheckResult.run_id == latest_run.id)
-            else:
-                query = query.filter(CheckResult.id == -1)
+            # Shared filters for the detail rows and the aggregates
+            filters = [
+                CheckResult.run_id == latest_run.id if latest_run else CheckResult.id == -1
+            ]
 
             # Apply target filter
             if target_ids:
-                query = query.filter(CheckResult.target_id.in_(target_ids))
+                filters.append(CheckResult.target_id.in_(target_ids))
 
             # Apply zone filter
             if zone_ids:
-                query = query.filter(CheckResult.zone_id.in_(zone_ids))
+                filters.append(CheckResult.zone_id.in_(zone_ids))
 
             # Apply status filter
             if status_filter and status_filter != "all":
-                query = query.filter(CheckResult.status == status_filter)
-
-            # Execute query
-            # NOTE: keep only the most recent result for each (target, zone) pair
-            # so reports do not duplicate entries when multiple checks were stored
-            # for the same target/zone in a single monitor run.
-            raw_results = query.order_by(CheckResult.last_checked.desc()).all()
-            seen_pairs = set()
-            results = []
-            for result in raw_results:
-                r, t, z = result
-                pair_key = (t.id, z.id)
-                if pair_key in seen_pairs:
-                    continue
-                seen_pairs.add(pair_key)
-                results.append(result)
-
-            # Process data
+                filters.append(CheckResult.status == status_filter)
+
+            # Execute query; the unique (target_id, zone_id) index guarantees
+            # one row per pair, so no deduplication is needed
+            results = db.execute(
+                select(*DETAIL_COLUMNS)
+                .join(Target, CheckResult.target_id == Target.id)
+                .join(Zone, CheckResult.zone_id == Zone.id)
+                .where(*filters)
+                .order_by(CheckResult.last_checked.desc())
+            ).all()
+
+            # Detailed results and status counts in one pass
+            status_counts = Counter()
+            detailed_results = []
+            for (
+                target, target_type, zone, status, a_records,
+                error_reason, last_checked, last_seen,
+            ) in results:
+                status_counts[status] += 1
+                detailed_results.append({
+                    "target": target,
+                    "target_type": target_type,
+                    "zone": zone,
+                    "status": status,
+                    "a_records_json": a_records or "[]",
+                    "error_reason": error_reason,
+                    "last_checked": last_checked.isoformat(),
+                    "last_seen": last_seen.isoformat(),
+                })
+
             summary = {
                 "total_results": len(results),
-                "listed_count": sum(1 for r, t, z in results if r.status == "listed"),
-                "blocked_count": sum(1 for r, t, z in results if r.status == "blocked"),
-                "error_count": sum(1 for r, t, z in results if r.status == "error"),
-                "blocked_ip_addresses": sorted({
-                    t.target for r, t, z in results if r.status == "blocked" and t.type == "ip"
-                }),
+                "listed_count": status_counts["listed"],
+                "blocked_count": status_counts["blocked"],
+                "error_count": status_counts["error"],
+                "blocked_ip_addresses": self._blocked_ip_query(db, filters),
                 "monitor_run_id": latest_run.id if latest_run else None,
                 "monitor_run_started_at": latest_run.started_at.isoformat() if latest_run else None,
                 "monitor_run_finished_at": latest_run.finished_at.isoformat() if latest_run and latest_run.finished_at else None,
             }
 
             # Per-target breakdown
-            target_breakdown = {}
-            for r, t, z in results:
-                if t.id not in target_breakdown:
-                    target_breakdown[t.id] = {
-                        "target": t.target,
-                        "type": t.type,
-                        "label": t.label,
-                        "listed": 0,
-                        "blocked": 0,
-                        "errors": 0,
-                    }
-                if r.status == "listed":
-                    target_breakdown[t.id]["listed"] += 1
-                elif r.status == "blocked":
-                    target_breakdown[t.id]["blocked"] += 1
-                elif r.status == "error":
-                    target_breakdown[t.id]["errors"] += 1
+            target_breakdown = [
+                {
+                    "target": target,
+                    "type": target_type,
+                    "label": label,
+                    "listed": listed,
+                    "blocked": blocked,
+                    "errors": errors,
+                }
+                for target, target_type, label, listed, blocked, errors in db.execute(
+                    select(Target.target, Target.type, Target.label, *STATUS_COUNTS)
+                    .join(Target, CheckResult.target_id == Target.id)
+                    .where(*filters)
+                    .group_by(Target.id, Target.target, Target.type, Target.label)
+                    .order_by(Target.target)
+                )
+            ]
 
             # Per-zone breakdown
-            zone_breakdown = {}
-            for r, t, z in results:
-                if z.id not in zone_breakdown:
-                    zone_breakdown[z.id] = {
-                        "zone": z.zone,
-                        "listed": 0,
-                        "blocked": 0,
-                        "errors": 0,
-                    }
-                if r.status == "listed":
-                    zone_breakdown[z.id]["listed"] += 1
-                elif r.status == "blocked":
-                    zone_breakdown[z.id]["blocked"] += 1
-                elif r.status == "error":
-                    zone_breakdown[z.id]["errors"] += 1
-
-            # Detailed results
-            detailed_results = []
-            for r, t, z in results:
-                detailed_results.append({
-                    "target": t.target,
-                    "target_type": t.type,
-                    "zone": z.zone,
-                    "status": r.status,
-                    "a_records": json.loads(r.a_records) if r.a_records else [],
-                    "error_reason": r.error_reason,
-                    "last_checked": r.last_checked.isoformat(),
-                    "last_seen": r.last_seen.isoformat(),
-                })
+            zone_breakdown = [
+                {"zone": zone, "listed": listed, "blocked": blocked, "errors": errors}
+                for zone, listed, blocked, errors in db.execute(
+                    select(Zone.zone, *STATUS_COUNTS)
+                    .join(Zone, CheckResult.zone_id == Zone.id)
+                    .where(*filters)
+                    .group_by(Zone.id, Zone.zone)
+                    .order_by(Zone.zone)
+                )
+            ]
 
             return {
                 "summary": summary,
-                "target_breakdown": list(target_breakdown.values()),
-                "zone_breakdown": list(zone_breakdown.values()),
+                "target_breakdown": target_breakdown,
+                "zone_breakdown": zone_breakdown,
                 "detailed_results": detailed_results,
             }
 
-    def _generate_csv(self, data: dict) -> tuple[str, int]:
-        """Generate CSV report."""
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"report_{timestamp}.csv"
-        filepath = os.path.join(self.reports_dir, filename)
-
-        with open(filepath, "w", newline="") as f:
+    def _generate_csv(self, data: dict, filepath: str, compress: bool = False) -> int:
+        """Generate CSV report at filepath, gzipped when compress is set; return its size."""
+        if compress:
+            output = gzip.open(
+                filepath, "wt", compresslevel=CSV_GZIP_LEVEL, newline="", encoding="utf-8"
+            )
+        else:
+            output = open(filepath, "w", newline="", buffering=CSV_BUFFER_BYTES)
+        with output as f:
             writer = csv.writer(f)
 
             # Write summary
@@ -211,33 +388,36 @@ class ReportService:
             writer.writerow(["Detailed Results"])
             writer.writerow(["Target", "Type", "Zone", "Status", "A Records", "Error", "Last Checked", "Last Seen"])
 
-            for result in data["detailed_results"][:settings.REPORT_MAX_ROWS]:
-                writer.writerow([
+            writer.writerows(
+                (
                     result["target"],
                     result["target_type"],
                     result["zone"],
                     result["status"],
-                    json.dumps(result["a_records"]),
+                    result["a_records_json"],
                     result["error_reason"] or "",
                     result["last_checked"],
                     result["last_seen"],
-                ])
+                )
+                for result in data["detailed_results"][:settings.REPORT_MAX_ROWS]
+            )
 
-        file_size = os.path.getsize(filepath)
-        return filepath, file_size
+        return os.path.getsize(filepath)
 
-    def _generate_xlsx(self, data: dict) -> tuple[str, int]:
-        """Generate XLSX report."""
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"report_{timestamp}.xlsx"
-        filepath = os.path.join(self.reports_dir, filename)
+    def _generate_xlsx(self, data: dict, filepath: str) -> int:
+        """Generate XLSX report at filepath and return its size."""
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
 
-        wb = Workbook()
-        ws_summary = wb.active
-        ws_summary.title = "Summary"
+        # Write-only mode streams rows to the sheet XML instead of keeping a
+        # cell tree in memory; column widths must be set before the first row
+        wb = Workbook(write_only=True)
 
-        # Write summary
-        ws_summary.append(["Summary"])
+        ws_summary = wb.create_sheet("Summary")
+        self._set_column_widths(ws_summary, XLSX_SUMMARY_WIDTHS)
+        title = WriteOnlyCell(ws_summary, value="Summary")
+        title.font = _xlsx_styles()[0]
+        ws_summary.append([title])
         ws_summary.append(["Total Results", data["summary"]["total_results"]])
         ws_summary.append(["Listed Count", data["summary"]["listed_count"]])
         ws_summary.append(["Blocked Count", data["summary"]["blocked_count"]])
@@ -252,117 +432,134 @@ class ReportService:
         ws_summary.append(["Run Started", data["summary"]["monitor_run_started_at"] or "N/A"])
         ws_summary.append(["Run Finished", data["summary"]["monitor_run_finished_at"] or "N/A"])
 
-        # Format summary header
-        ws_summary["A1"].font = Font(bold=True, size=14)
-
         # Create target breakdown sheet
         ws_targets = wb.create_sheet("Target Breakdown")
-        ws_targets.append(["Target", "Type", "Label", "Listed", "Blocked", "Errors"])
+        self._set_column_widths(ws_targets, XLSX_TARGET_WIDTHS)
+        self._append_header(ws_targets, ["Target", "Type", "Label", "Listed", "Blocked", "Errors"])
 
         for item in data["target_breakdown"]:
-            ws_targets.append([
+            ws_targets.append((
                 item["target"],
                 item["type"],
                 item["label"] or "",
                 item["listed"],
                 item["blocked"],
                 item["errors"],
-            ])
-
-        # Format header
-        for cell in ws_targets[1]:
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+            ))
 
         # Create zone breakdown sheet
         ws_zones = wb.create_sheet("Zone Breakdown")
-        ws_zones.append(["Zone", "Listed", "Blocked", "Errors"])
+        self._set_column_widths(ws_zones, XLSX_ZONE_WIDTHS)
+        self._append_header(ws_zones, ["Zone", "Listed", "Blocked", "Errors"])
 
         for item in data["zone_breakdown"]:
-            ws_zones.append([
+            ws_zones.append((
                 item["zone"],
                 item["listed"],
                 item["blocked"],
                 item["errors"],
-            ])
-
-        # Format header
-        for cell in ws_zones[1]:
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+            ))
 
         # Create detailed results sheet
         ws_details = wb.create_sheet("Detailed Results")
-        ws_details.append(["Target", "Type", "Zone", "Status", "A Records", "Error", "Last Checked", "Last Seen"])
+        self._set_column_widths(ws_details, XLSX_DETAIL_WIDTHS)
+        self._append_header(
+            ws_details,
+            ["Target", "Type", "Zone", "Status", "A Records", "Error", "Last Checked", "Last Seen"],
+        )
 
         for result in data["detailed_results"][:settings.REPORT_MAX_ROWS]:
-            ws_details.append([
+            ws_details.append((
                 result["target"],
                 result["target_type"],
                 result["zone"],
                 result["status"],
-                json.dumps(result["a_records"]),
+                result["a_records_json"],
                 result["error_reason"] or "",
                 result["last_checked"],
                 result["last_seen"],
-            ])
-
-        # Format header
-        for cell in ws_details[1]:
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-
-        # Adjust column widths
-        for sheet in wb:
-            for column in sheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                sheet.column_dimensions[column_letter].width = adjusted_width
+            ))
 
         wb.save(filepath)
 
-        file_size = os.path.getsize(filepath)
-        return filepath, file_size
+        return os.path.getsize(filepath)
+
+    @staticmethod
+    def _set_column_widths(ws, widths: dict) -> None:
+        """Set fixed column widths on a write-only sheet."""
+        for column_letter, width in widths.items():
+            ws.column_dimensions[column_letter].width = width
+
+    @staticmethod
+    def _append_header(ws, headers: List[str]) -> None:
+        """Append a bold, shaded header row to a write-only sheet."""
+        from openpyxl.cell import WriteOnlyCell
+
+        _, header_font, header_fill = _xlsx_styles()
+        cells = []
+        for value in headers:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.font = header_font
+            cell.fill = header_fill
+            cells.append(cell)
+        ws.append(cells)
+
+    def _generate_pdf(self, data: dict, filepath: str) -> int:
+        """
+        Generate PDF report at filepath and return its size.
 
-    def _generate_pdf(self, data: dict) -> tuple[str, int]:
-        """Generate PDF report."""
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"report_{timestamp}.pdf"
-        filepath = os.path.join(self.reports_dir, filename)
+        Pages are drawn straight onto a canvas. The zone breakdown is a small
+        Platypus table split across pages as needed; detailed results use fixed
+        row heights and are paginated by arithmetic, so long reports cost one
+        draw call per cell instead of a layout pass per row.
+        """
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.utils import simpleSplit
+        from reportlab.pdfgen import canvas
+        from reportlab.platypus import Table
 
-        doc = SimpleDocTemplate(filepath, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
+        c = canvas.Canvas(filepath, pagesize=A4)
+        page_width, page_height = A4
+        content_width = page_width - 2 * PDF_MARGIN
+        top = page_height - PDF_MARGIN
+        y = top
 
         # Title
-        title_style = styles["Heading1"]
-        title = Paragraph("IP Reputation Monitor Report", title_style)
-        story.append(title)
-        story.append(Spacer(1, 12))
+        c.setFont("Helvetica-Bold", 18)
+        y -= 18
+        c.drawString(PDF_MARGIN, y, "IP Reputation Monitor Report")
+        y -= 24
 
         # Summary
-        summary_style = styles["Normal"]
-        story.append(Paragraph("<b>Summary</b>", styles["Heading2"]))
-        story.append(Paragraph(f"Total Results: {data['summary']['total_results']}", summary_style))
-        story.append(Paragraph(f"Listed Count: {data['summary']['listed_count']}", summary_style))
-        story.append(Paragraph(f"Blocked Count: {data['summary']['blocked_count']}", summary_style))
-        blocked_ip_addresses = data["summary"]["blocked_ip_addresses"]
-        blocked_ip_text = ", ".join(blocked_ip_addresses) if blocked_ip_addresses else "None"
-        story.append(Paragraph(f"Blocked IP Addresses: {blocked_ip_text}", summary_style))
-        story.append(Paragraph(f"Error Count: {data['summary']['error_count']}", summary_style))
-        story.append(Paragraph(f"Date From: {data['summary']['date_from'] or 'N/A'}", summary_style))
-        story.append(Paragraph(f"Date To: {data['summary']['date_to'] or 'N/A'}", summary_style))
-        story.append(Spacer(1, 12))
+        c.setFont("Helvetica-Bold", 14)
+        y -= 14
+        c.drawString(PDF_MARGIN, y, "Summary")
+        y -= 8
+        summary = data["summary"]
+        blocked_ip_addresses = summary["blocked_ip_addresses"]
+        summary_lines = [
+            f"Total Results: {summary['total_results']}",
+            f"Listed Count: {summary['listed_count']}",
+            f"Blocked Count: {summary['blocked_count']}",
+            f"Blocked IP Addresses: {', '.join(blocked_ip_addresses) if blocked_ip_addresses else 'None'}",
+            f"Error Count: {summary['error_count']}",
+            f"Monitor Run ID: {summary['monitor_run_id'] or 'N/A'}",
+            f"Run Started: {summary['monitor_run_started_at'] or 'N/A'}",
+            f"Run Finished: {summary['monitor_run_finished_at'] or 'N/A'}",
+        ]
+        c.setFont("Helvetica", 10)
+        for line in summary_lines:
+            for wrapped in simpleSplit(line, "Helvetica", 10, content_width):
+                if y - 14 < PDF_MARGIN:
+                    c.showPage()
+                    c.setFont("Helvetica", 10)
+                    y = top
+                y -= 14
+                c.drawString(PDF_MARGIN, y, wrapped)
+        y -= 12
 
         # Zone breakdown table
-        story.append(Paragraph("<b>Zone Breakdown</b>", styles["Heading2"]))
+        y = self._pdf_heading(c, "Zone Breakdown", y, top)
         zone_data = [["Zone", "Listed", "Blocked", "Errors"]]
         for item in data["zone_breakdown"]:
             zone_data.append([
@@ -371,38 +568,90 @@ class ReportService:
                 str(item["blocked"]),
                 str(item["errors"]),
             ])
-        zone_table = Table(zone_data)
-        zone_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
-        story.append(zone_table)
-        story.append(Spacer(1, 12))
-
-        # Build PDF
-        doc.build(story)
-
-        file_size = os.path.getsize(filepath)
-        return filepath, file_size
+        pending = [Table(zone_data, style=PDF_ZONE_TABLE_STYLE, repeatRows=1)]
+        while pending:
+            table = pending.pop(0)
+            table_width, table_height = table.wrapOn(c, content_width, y - PDF_MARGIN)
+            if table_height <= y - PDF_MARGIN:
+                table.drawOn(c, (page_width - table_width) / 2, y - table_height)
+                y -= table_height + 12
+                continue
+            parts = table.split(content_width, y - PDF_MARGIN)
+            if parts:
+                part_width, part_height = parts[0].wrapOn(c, content_width, y - PDF_MARGIN)
+                parts[0].drawOn(c, (page_width - part_width) / 2, y - part_height)
+                pending[:0] = parts[1:]
+            else:
+                pending.insert(0, table)
+            c.showPage()
+            y = top
+
+        # Detailed results, drawn row by row with fixed row height
+        rows = data["detailed_results"][:settings.REPORT_MAX_ROWS]
+        if rows:
+            y = self._pdf_heading(c, "Detailed Results", y, top)
+            y = self._pdf_detail_header(c, y)
+            c.setFont("Helvetica", PDF_DETAIL_FONT_SIZE)
+            for result in rows:
+                if y - PDF_ROW_HEIGHT < PDF_MARGIN:
+                    c.showPage()
+                    y = self._pdf_detail_header(c, top)
+                    c.setFont("Helvetica", PDF_DETAIL_FONT_SIZE)
+                y -= PDF_ROW_HEIGHT
+                values = (
+                    result["target"],
+                    result["zone"],
+                    result["status"],
+                    result["a_records_json"],
+                    result["last_checked"][:19],
+                )
+                x = PDF_MARGIN
+                for value, (_, width) in zip(values, PDF_DETAIL_COLUMNS):
+                    c.drawString(x + 2, y + 3, _pdf_clip(value, width - 4))
+                    x += width
+
+        c.save()
+
+        return os.path.getsize(filepath)
+
+    @staticmethod
+    def _pdf_heading(c, text: str, y: float, top: float) -> float:
+        """Draw a section heading, starting a new page if little room is left."""
+        if y - 60 < PDF_MARGIN:
+            c.showPage()
+            y = top
+        c.setFont("Helvetica-Bold", 14)
+        y -= 14
+        c.drawString(PDF_MARGIN, y, text)
+        return y - 8
+
+    @staticmethod
+    def _pdf_detail_header(c, y: float) -> float:
+        """Draw the detailed results header row and return the y below it."""
+        y -= PDF_ROW_HEIGHT
+        c.setFillColor("grey")
+        c.rect(PDF_MARGIN, y, sum(width for _, width in PDF_DETAIL_COLUMNS), PDF_ROW_HEIGHT, stroke=0, fill=1)
+        c.setFillColor("whitesmoke")
+        c.setFont("Helvetica-Bold", PDF_DETAIL_FONT_SIZE)
+        x = PDF_MARGIN
+        for title, width in PDF_DETAIL_COLUMNS:
+            c.drawString(x + 2, y + 3, title)
+            x += width
+        c.setFillColor("black")
+        return y
 
     def cleanup_old_reports(self, retention_days: int = None) -> int:
         """Remove reports older than retention period."""
         retention_days = retention_days or settings.REPORT_RETENTION_DAYS
         cutoff = datetime.utcnow().timestamp() - (retention_days * 24 * 60 * 60)
 
+        # scandir entries carry the file type and cache their stat result,
+        # so each file costs one stat call
         removed_count = 0
-        for filename in os.listdir(self.reports_dir):
-            filepath = os.path.join(self.reports_dir, filename)
-            if os.path.isfile(filepath):
-                file_mtime = os.path.getmtime(filepath)
-                if file_mtime < cutoff:
-                    os.remove(filepath)
+        with os.scandir(self.reports_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
                     removed_count += 1
 
         return removed_count
@@ -410,11 +659,15 @@ class ReportService:
 
 # Global report service instance
 _report_service: Optional[ReportService] = None
+_report_service_lock = threading.Lock()
 
 
 def get_report_service() -> ReportService:
     """Get or create global report service instance."""
     global _report_service
     if _report_service is None:
-        _report_service = ReportService()
+        # Sync endpoints run in a threadpool, so two first requests can race here
+        with _report_service_lock:
+            if _report_service is None:
+                _report_service = ReportService()
     return _report_service